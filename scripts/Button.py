@@ -1,5 +1,4 @@
 import pygame
-pygame.init()
 
 class Button():
 	def __init__(self, x, y, image, scale=1.0):
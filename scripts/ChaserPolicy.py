@@ -0,0 +1,160 @@
+import os
+import itertools
+import threading
+import numpy as np
+
+import Config
+
+# activations the exported dense layers may use
+ACTIVATIONS = {
+	"relu": lambda x: np.maximum(x, 0),
+	"tanh": np.tanh,
+	"sigmoid": lambda x: 1 / (1 + np.exp(-x)),
+	"linear": lambda x: x,
+}
+
+class NumpyPolicy():
+	"""Evaluates the chaser MLP exported by export_weights() with plain NumPy matmuls.
+
+	Takes (n, 3) states of (dx, dy, distance) and returns (n, 2) movement actions,
+	without importing TensorFlow.
+	"""
+	def __init__(self, path):
+		data = np.load(path)
+		layers = int(data["layers"])
+		self.weights = [data[f"w{i}"].astype(np.float32) for i in range(layers)]
+		self.biases = [data[f"b{i}"].astype(np.float32) for i in range(layers)]
+		self.activations = [ACTIVATIONS[str(name)] for name in data["activations"]]
+
+	def predict(self, states):
+		x = np.asarray(states, dtype=np.float32)
+		for w, b, activation in zip(self.weights, self.biases, self.activations):
+			x = activation(x @ w + b)
+		return x
+
+class KerasPolicy():
+	"""Runs a saved Keras model; TensorFlow is only imported when one is loaded."""
+	def __init__(self, path):
+		import tensorflow as tf
+		self.model = tf.keras.models.load_model(path, compile=False)
+
+	# calling the model directly skips predict()'s per-call setup, which dominates for a few rows
+	def predict(self, states):
+		return np.asarray(self.model(np.asarray(states, dtype=np.float32), training=False))
+
+class LookupPolicy():
+	"""Answers from a policy sampled on a dense (dx, dy, distance) grid by build_chaser_lut.py.
+
+	States between grid points are trilinearly interpolated; states outside the
+	sampled range are clamped to its edge. The grid axes may be unevenly spaced.
+	"""
+	def __init__(self, path):
+		data = np.load(path)
+		table = data["table"].astype(np.float32)	# (nx, ny, nd, actions)
+		self.axes = [data["dx"], data["dy"], data["distance"]]
+		self.flat = table.reshape(-1, table.shape[3])
+
+		# flat offsets of the 8 corners of a grid cell, and which axes each corner steps along
+		self.strides = np.array([table.shape[1] * table.shape[2], table.shape[2], 1])
+		self.corners = np.array(list(itertools.product((0, 1), repeat=3)))
+		self.corner_offsets = self.corners @ self.strides
+
+	def predict(self, states):
+		x = np.asarray(states, dtype=np.float32)
+		cells = np.empty(x.shape, dtype=np.intp)
+		frac = np.empty(x.shape, dtype=np.float32)
+
+		# grid cell of each state and its position inside the cell, per axis
+		for a, axis in enumerate(self.axes):
+			v = np.clip(x[:, a], axis[0], axis[-1])
+			i = np.clip(np.searchsorted(axis, v, side="right") - 1, 0, len(axis) - 2)
+			cells[:, a] = i
+			frac[:, a] = (v - axis[i]) / (axis[i + 1] - axis[i])
+
+		index = (cells @ self.strides)[:, None] + self.corner_offsets
+		weights = np.where(self.corners, frac[:, None, :], 1 - frac[:, None, :]).prod(axis=2)
+		return np.einsum("nc,nca->na", weights, self.flat[index])
+
+class AsyncPolicy():
+	"""Evaluates a policy on a background thread so the game loop never waits for it.
+
+	submit() hands over the newest state, replacing one the worker has not picked
+	up yet; latest() returns the most recent (frame, actions) result, or None.
+	If the policy raises, the worker stops and latest() re-raises the error.
+	"""
+	def __init__(self, policy):
+		self.policy = policy
+		self.condition = threading.Condition()
+		self.pending = None		# (frame, states) waiting for the worker
+		self.result = None		# (frame, actions) last published
+		self.error = None		# exception that stopped the worker
+		self.running = True
+		self.thread = threading.Thread(target=self.work, daemon=True)
+		self.thread.start()
+
+	def submit(self, frame, states):
+		with self.condition:
+			self.pending = (frame, np.array(states, dtype=np.float32))
+			self.condition.notify()
+
+	def latest(self):
+		with self.condition:
+			if self.error is not None:
+				raise RuntimeError("chaser policy failed on the background thread") from self.error
+			return self.result
+
+	def work(self):
+		while True:
+			with self.condition:
+				while self.pending is None and self.running:
+					self.condition.wait()
+				if not self.running:
+					return
+				frame, states = self.pending
+				self.pending = None
+
+			try:
+				actions = self.policy.predict(states)
+			except Exception as e:
+				print(f"Chaser policy failed: {e!r}")
+				with self.condition:
+					self.error = e
+				return
+			with self.condition:
+				self.result = (frame, actions)
+
+	def close(self):
+		with self.condition:
+			self.running = False
+			self.condition.notify()
+
+# save the dense layers of a Keras model (as built by train_chaser.create_model) to an .npz
+def export_weights(model, path):
+	arrays = {}
+	activations = []
+	for layer in model.layers:
+		weights = layer.get_weights()
+		if not weights:
+			continue	# input/reshape layers carry no weights
+
+		kernel, bias = weights
+		n = len(activations)
+		arrays[f"w{n}"] = kernel
+		arrays[f"b{n}"] = bias
+		activations.append(layer.get_config().get("activation", "linear"))
+
+	np.savez(path, layers=len(activations), activations=np.array(activations), **arrays)
+
+# policy selected by Config.CHASER_POLICY, or None for the direct-chase heuristic
+def load_policy(kind=None):
+	kind = kind or Config.CHASER_POLICY
+	weights = Config.Models["chaser_weights"]
+	keras_model = Config.Models["chaser"]
+
+	if kind == "lut":
+		return LookupPolicy(Config.Models["chaser_lut"])
+	if kind == "numpy" or (kind == "auto" and os.path.exists(weights)):
+		return NumpyPolicy(weights)
+	if kind == "keras" or (kind == "auto" and os.path.exists(keras_model)):
+		return KerasPolicy(keras_model)
+	return None
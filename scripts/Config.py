@@ -6,6 +6,29 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Global scale factor for the game
 SCALE_FACTOR = 0.85  # 85% of original size
 
+# ------------ Rendering ------------
+
+DIRTY_RECTS = True	# during gameplay, push only the regions that changed to the display
+
+# the simulation advances in fixed ticks; frames are drawn as often as MAX_FPS allows,
+# with sprites placed between their last two ticks
+TICK_RATE = 60				# simulation ticks per second; movement speeds are per tick
+MAX_FPS = 60				# frame rate cap; raise it (or 0 for no cap, paced by VSYNC if set) on machines with headroom
+MAX_TICKS_PER_FRAME = 8		# ticks caught up per frame at most, after which a slow machine runs slowed down
+VSYNC = False				# wait for the display's refresh when pushing a frame
+
+# screens with nothing moving wait for input instead of redrawing at the full rate
+IDLE_FPS = 10				# menu and end screens: redraw on input, otherwise this often
+PAUSED_FPS = 30				# while a question pauses the game, enough for its fades and animations
+
+# ------------ Profiler ------------
+
+# F3 shows the frame-time overlay (and starts timing), F4 writes the recorded frames to PROFILER_CSV
+PROFILER = False			# show the overlay from the start
+PROFILER_WINDOW = 120		# frames the rolling mean / p95 / p99 are taken over
+PROFILER_HISTORY = 3600		# frames kept for the CSV export
+PROFILER_CSV = "frame_profile.csv"	# relative to the working directory
+
 # ------------ Colors ------------
 
 Colors = {
@@ -47,6 +70,11 @@ Sprites = {
 	"bird" : os.path.join(PROJECT_ROOT, "sprites", "Player", "chaser.png"),
 }
 
+# ------------ Sprite Atlas ------------
+
+# packed copy of Sprites and Player, written by build_atlas.py
+ATLAS = os.path.join(PROJECT_ROOT, "sprites", "atlas.json")
+
 # ------------ Player Sprites ------------
 
 Player = {
@@ -83,6 +111,36 @@ UI = {
 	"resume" : os.path.join(PROJECT_ROOT, "sprites", "UI", "resume_button.png"),
 }
 
+# ------------ Models ------------
+
+# relative to the working directory, where train_chaser.py saves them
+Models = {
+	"chaser" : "chaser_model.h5",			# Keras policy written by train_chaser.py
+	"chaser_weights" : "chaser_model.npz",	# the same policy exported by export_chaser.py
+	"chaser_lut" : "chaser_lut.npz",		# the policy sampled on a grid by build_chaser_lut.py
+}
+
+# "auto" prefers the exported weights, then the Keras model, then the direct-chase heuristic;
+# "numpy", "keras", "lut" or "heuristic" force one of them
+CHASER_POLICY = "auto"
+
+# run the policy on a background thread; the chaser uses the latest finished action and
+# chases directly when that action is more than CHASER_MAX_STALENESS frames old
+CHASER_ASYNC = False
+CHASER_MAX_STALENESS = 3
+
+# chasers spawned on each level (by level index); more than one runs as a vectorized swarm
+CHASERS_PER_LEVEL = [1, 1, 1, 1]
+
+# ------------ Questions ------------
+
+# one JSON question per line, tagged with a topic and a difficulty; QuestionBank.py indexes it
+QUESTION_BANK = os.path.join(PROJECT_ROOT, "questions", "questions.jsonl")
+QUESTION_TOPIC = None		# ask only questions of this topic; None asks any
+QUESTION_DIFFICULTY = None	# ask only questions of this difficulty; None asks any
+HINT_CACHE_SIZE = 8			# "Ask AI" hint images kept decoded and scaled
+HINT_PREFETCH = 2			# upcoming questions whose hint images are decoded ahead of time
+
 # ------------ Sounds ------------
 
 Sounds = {
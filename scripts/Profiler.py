@@ -0,0 +1,121 @@
+import csv
+import time
+from collections import deque
+import numpy as np
+import pygame
+
+import Config
+
+class FrameProfiler():
+	"""Times the phases of each game frame and shows them as an overlay.
+
+	The loop calls begin_frame(), then lap(name) after each phase, which
+	charges the time since the previous lap to that phase, and end_frame().
+	Timing only runs while the overlay is shown. The overlay lists the rolling
+	mean, p95 and p99 of every phase over the last `window` frames; the last
+	`history` frames can be written to a CSV with export_csv().
+	"""
+	def __init__(self, enabled=Config.PROFILER, window=Config.PROFILER_WINDOW, history=Config.PROFILER_HISTORY):
+		self.enabled = enabled
+		self.window = window
+		self.phases = []						# phase names, in first-seen order
+		self.samples = {}						# phase -> deque of the last `window` times (ms)
+		self.history = deque(maxlen=history)	# per-frame {phase: ms}
+		self.frame = None						# phases timed so far this frame
+		self.frame_count = 0
+		self.last = 0
+		self.font = None
+		self.panel = None						# rendered overlay, refreshed every few frames
+
+	def toggle(self):
+		self.enabled = not self.enabled
+		self.frame = None
+
+	def begin_frame(self):
+		if not self.enabled:
+			return
+		self.frame = {}
+		self.last = time.perf_counter()
+
+	# charge the time since the previous lap (or begin_frame) to phase
+	def lap(self, phase):
+		if self.frame is None:
+			return
+		now = time.perf_counter()
+		self.frame[phase] = self.frame.get(phase, 0.0) + (now - self.last) * 1000
+		self.last = now
+
+	def end_frame(self):
+		if self.frame is None:
+			return
+		total = sum(self.frame.values())
+		for phase, ms in self.frame.items():
+			if phase not in self.samples:
+				self.phases.append(phase)
+				self.samples[phase] = deque(maxlen=self.window)
+			self.samples[phase].append(ms)
+		self.frame["total"] = total
+		self.samples.setdefault("total", deque(maxlen=self.window)).append(total)
+
+		# phases skipped this frame (the menu, end screens) count as zero
+		for phase in self.phases:
+			if phase not in self.frame:
+				self.samples[phase].append(0.0)
+
+		self.frame_count += 1
+		self.history.append((self.frame_count, self.frame))
+		self.frame = None
+
+	# every phase seen, in first-seen order, then the frame total
+	def columns(self):
+		return self.phases + ["total"]
+
+	# (phase, mean, p95, p99) in milliseconds over the rolling window
+	def stats(self):
+		rows = []
+		for phase in self.columns():
+			times = np.fromiter(self.samples[phase], dtype=float)
+			p95, p99 = np.percentile(times, [95, 99])
+			rows.append((phase, times.mean(), p95, p99))
+		return rows
+
+	# draw the overlay onto surface; returns the rect drawn, or None when hidden
+	def draw(self, surface, refresh=15):
+		if not self.enabled or not self.phases:
+			return None
+
+		# percentiles and text rendering are redone every `refresh` frames, not every frame
+		if self.panel is None or self.frame_count % refresh == 0:
+			self.panel = self.render()
+		return surface.blit(self.panel, (10, surface.get_height() - self.panel.get_height() - 10))
+
+	def render(self):
+		if self.font is None:
+			self.font = pygame.font.SysFont('couriernew', 14)
+
+		# one text per cell, laid out in measured columns so any font lines up
+		rows = [("phase", "mean", "p95", "p99 ms")]
+		rows += [(phase, f"{mean:.2f}", f"{p95:.2f}", f"{p99:.2f}") for phase, mean, p95, p99 in self.stats()]
+		cells = [[self.font.render(text, True, (255, 255, 255)) for text in row] for row in rows]
+		widths = [max(row[c].get_width() for row in cells) + 12 for c in range(len(rows[0]))]
+
+		line_height = self.font.get_linesize()
+		panel = pygame.Surface((sum(widths) + 6, len(cells) * line_height + 8))
+		panel.fill((20, 20, 20))
+		for i, row in enumerate(cells):
+			x = 6
+			for c, text in enumerate(row):
+				# phase names left-aligned, numbers right-aligned
+				offset = 0 if c == 0 else widths[c] - 12 - text.get_width()
+				panel.blit(text, (x + offset, 4 + i * line_height))
+				x += widths[c]
+		return panel
+
+	# write the recorded frames, one row each, with a column per phase
+	def export_csv(self, path=Config.PROFILER_CSV):
+		with open(path, "w", newline="") as f:
+			writer = csv.writer(f)
+			writer.writerow(["frame"] + self.columns())
+			for frame, phases in self.history:
+				writer.writerow([frame] + [f"{phases.get(phase, 0.0):.3f}" for phase in self.columns()])
+		print(f"Wrote {len(self.history)} frames to {path}")
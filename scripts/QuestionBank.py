@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import random
+import hashlib
+import numpy as np
+
+import Config
+
+class QuestionBank():
+	"""Questions stored one JSON object per line, read from disk only when asked for.
+
+	A small index next to the bank holds each question's byte offset, topic and
+	difficulty, so opening a bank of any size reads only the index; a question's
+	body is parsed when get() is called. The index is rebuilt automatically when
+	the bank file changes.
+	"""
+	def __init__(self, path, index_path=None):
+		self.path = path
+		self.index_path = index_path or os.path.splitext(path)[0] + ".index.npz"
+		self.offsets = None			# byte offset of each question's line
+		self.topics = None			# topic id of each question
+		self.difficulties = None	# difficulty of each question
+		self.topic_names = []		# topic id -> name
+
+	def __len__(self):
+		self.load_index()
+		return len(self.offsets)
+
+	# every question in bank order, read in one pass
+	def __iter__(self):
+		with open(self.path, "rb") as f:
+			for line in f:
+				if line.strip():
+					yield json.loads(line)
+
+	# size and modification time of the bank, checked before falling back to its digest
+	def stamp(self):
+		stat = os.stat(self.path)
+		return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+	# digest of the bank file, to tell whether the saved index still matches it
+	def fingerprint(self):
+		digest = hashlib.sha1()
+		with open(self.path, "rb") as f:
+			for block in iter(lambda: f.read(1 << 20), b""):
+				digest.update(block)
+		return digest.hexdigest()
+
+	def load_index(self):
+		if self.offsets is not None:
+			return
+
+		if os.path.exists(self.index_path):
+			index = np.load(self.index_path)
+			fresh = np.array_equal(index["stamp"], self.stamp())
+			# a new stamp (e.g. after a checkout) with unchanged contents only needs re-stamping
+			if fresh or str(index["fingerprint"]) == self.fingerprint():
+				self.offsets = index["offsets"]
+				self.topics = index["topics"]
+				self.difficulties = index["difficulties"]
+				self.topic_names = [str(name) for name in index["topic_names"]]
+				if not fresh:
+					self.save_index()
+				return
+
+		self.build_index()
+
+	# scan the bank once for offsets and tags, and save them for the next start
+	def build_index(self):
+		offsets, topics, difficulties = [], [], []
+		topic_ids = {}
+		with open(self.path, "rb") as f:
+			offset = 0
+			for line in f:
+				if line.strip():
+					question = json.loads(line)
+					topic = question.get("topic", "")
+					offsets.append(offset)
+					topics.append(topic_ids.setdefault(topic, len(topic_ids)))
+					difficulties.append(question.get("difficulty", 0))
+				offset += len(line)
+
+		self.offsets = np.array(offsets, dtype=np.int64)
+		self.topics = np.array(topics, dtype=np.int32)
+		self.difficulties = np.array(difficulties, dtype=np.int32)
+		self.topic_names = list(topic_ids)
+		self.save_index()
+
+	def save_index(self):
+		try:
+			np.savez(self.index_path, offsets=self.offsets, topics=self.topics, difficulties=self.difficulties,
+					 topic_names=np.array(self.topic_names), stamp=self.stamp(), fingerprint=self.fingerprint())
+		except OSError:
+			pass	# a read-only install just rebuilds the index in memory each start
+
+	# the question at position, parsed from its line
+	def get(self, position):
+		self.load_index()
+		with open(self.path, "rb") as f:
+			f.seek(self.offsets[position])
+			return json.loads(f.readline())
+
+	# positions of the questions matching a topic and/or difficulty (None matches all)
+	def select(self, topic=None, difficulty=None):
+		self.load_index()
+		if topic is None and difficulty is None:
+			return None		# the whole bank, without materializing its positions
+
+		mask = np.ones(len(self.offsets), dtype=bool)
+		if topic is not None:
+			topic_id = self.topic_names.index(topic) if topic in self.topic_names else -1
+			mask &= self.topics == topic_id
+		if difficulty is not None:
+			mask &= self.difficulties == difficulty
+		return np.flatnonzero(mask)
+
+	def sampler(self, topic=None, difficulty=None, rng=None):
+		positions = self.select(topic, difficulty)
+		return QuestionSampler(len(self) if positions is None else positions, rng)
+
+class QuestionSampler():
+	"""Draws question positions at random without replacement, in O(1) per draw.
+
+	A Fisher-Yates shuffle run lazily: only the swapped slots are stored, so
+	memory grows with the number of draws, not with the bank. When every
+	question has been drawn, the pool refills in O(1).
+	"""
+	def __init__(self, positions, rng=None):
+		self.positions = positions	# array of positions, or a count meaning range(count)
+		self.size = positions if isinstance(positions, int) else len(positions)
+		self.rng = rng or random
+		self.reset()
+
+	def __len__(self):
+		return self.size
+
+	def reset(self):
+		self.remaining = self.size
+		self.swapped = {}
+
+	def draw(self):
+		if self.size == 0:
+			raise IndexError("no questions match the selection")
+		if self.remaining == 0:
+			self.reset()
+
+		i = self.rng.randrange(self.remaining)
+		self.remaining -= 1
+		drawn = self.swapped.get(i, i)
+		self.swapped[i] = self.swapped.pop(self.remaining, self.remaining)
+
+		if isinstance(self.positions, int):
+			return drawn
+		return int(self.positions[drawn])
+
+# questions shared by the whole game; the index is read on first use
+questions = QuestionBank(Config.QUESTION_BANK)
+
+if __name__ == "__main__":
+	# rebuild the index of a bank after editing it:
+	#   python QuestionBank.py [bank.jsonl]
+	bank = QuestionBank(sys.argv[1]) if len(sys.argv) > 1 else questions
+	bank.build_index()
+	print(f"Indexed {len(bank)} questions in {len(bank.topic_names)} topics: {bank.index_path}")
@@ -4,13 +4,20 @@ import os
 import sys
 import random
 import math
+import numpy as np
+from collections import OrderedDict, deque
 
 # Add Button import
 from Button import Button
+from QuestionBank import questions
+from Textures import ScaledImageCache
 
 # Import scale factor from config
 from Config import SCALE_FACTOR
 
+GRADIENT_CACHE_SIZE = 32    # gradient surfaces kept; a question uses a handful
+LAYOUT_CACHE_SIZE = 16      # laid-out questions kept
+
 class QuestionUI:
     def __init__(self, screen):
         self.screen = screen
@@ -30,10 +37,12 @@ class QuestionUI:
         self.animation_time = 0
         self.show_feedback = False
         self.feedback_message = ""
+        self.gradient_cache = OrderedDict()  # (size, colors) -> gradient surface
+        self.layout_cache = OrderedDict()  # (question, font sizes) -> wrapped, rendered lines
+        self.feedback_layout = None  # (message, rendered lines, box surface)
         
         # Track asked questions
         self.asked_questions = set()
-        self.available_questions = []
         
         # Enhanced color scheme
         self.colors = {
@@ -67,62 +76,10 @@ class QuestionUI:
         # Create option buttons
         self.create_buttons()
         
-        # Questions list
-        self.questions = [
-            {
-                "question": "Why might a large company lease machinery instead of buying it outright?",
-                "options": ["To increase taxes", "To own it faster", "To reduce upfront costs and save cash", "To avoid training employees"],
-                "correct": 2,
-                "explanation": "Leasing machinery helps companies reduce upfront costs and conserve cash flow.",
-                "image_path": "sprites/questions/lease_machinery.png"
-            },
-            {
-                "question": "What is one major benefit of leasing equipment instead of buying it?",
-                "options": ["You can return it after each use", "Lower maintenance fees", "No need for insurance", "Use now, pay over time"],
-                "correct": 3,
-                "explanation": "Leasing allows companies to use equipment immediately while spreading the cost over time.",
-                "image_path": "sprites/questions/leasing_benefit.png"
-            },
-            {
-                "question": "Leasing equipment is often preferred by businesses because:",
-                "options": ["It comes with free upgrades", "It requires no legal contracts", "It frees up money for other investments", "It removes the need for employees"],
-                "correct": 2,
-                "explanation": "Leasing frees up capital that can be used for other business investments.",
-                "image_path": "sprites/questions/leasing_preference.png"
-            },
-            {
-                "question": "What does a company usually offer as security when taking a loan backed by assets?",
-                "options": ["Its future ideas", "Inventory or unpaid customer invoices", "Social media followers", "Office snacks"],
-                "correct": 1,
-                "explanation": "Companies typically use inventory or accounts receivable as security for asset-backed loans.",
-                "image_path": "sprites/questions/asset_security.png"
-            },
-            {
-                "question": "Why would a business use a loan backed by its assets?",
-                "options": ["To buy shares in other companies", "To get quick access to money without selling ownership", "To shut down operations", "To pay employee bonuses only"],
-                "correct": 1,
-                "explanation": "Asset-backed loans provide quick access to capital without giving up company ownership.",
-                "image_path": "sprites/questions/asset_loan.png"
-            },
-            {
-                "question": "What kind of assets can help a company get a business loan?",
-                "options": ["Office pets", "Furniture only", "Equipment, inventory, or customer payments due", "Company name"],
-                "correct": 2,
-                "explanation": "Tangible assets like equipment, inventory, and accounts receivable can be used as collateral.",
-                "image_path": "sprites/questions/business_assets.png"
-            },
-            {
-                "question": "Why would a company choose a loan secured by assets instead of a regular loan?",
-                "options": ["Easier to qualify if the company owns valuable stuff", "It always comes with free gadgets", "It doesn't need to be repaid", "It avoids any paperwork"],
-                "correct": 0,
-                "explanation": "Asset-secured loans are often easier to qualify for if the company has valuable assets.",
-                "image_path": "sprites/questions/asset_secured_loan.png"
-            },
-            
-        ]
-        
-        # Initialize available questions
-        self.reset_available_questions()
+        # Questions are drawn from the shared on-disk bank
+        self.sampler = questions.sampler(Config.QUESTION_TOPIC, Config.QUESTION_DIFFICULTY)
+        self.upcoming = deque()     # positions drawn ahead so their hint images can be prefetched
+        self.hint_images = ScaledImageCache(Config.HINT_CACHE_SIZE)
         
         self.showing_ai_image = False
         self.ai_image = None
@@ -131,14 +88,27 @@ class QuestionUI:
         self.ask_ai_clicked = False
     
     def create_gradient_surface(self, width, height, start_color, end_color, angle=0):
+        """Vertical gradient from start_color (top) to end_color (bottom).
+
+        Surfaces are shared through a bounded LRU cache keyed by size and colors,
+        so callers must not draw on them. `angle` is accepted for compatibility
+        but has never changed the result, so it is not part of the key.
+        """
+        key = (width, height, tuple(start_color), tuple(end_color))
+        surface = self.gradient_cache.get(key)
+        if surface is not None:
+            self.gradient_cache.move_to_end(key)
+            return surface
+
+        # one color per row, truncated like the per-row draw.line version
+        ratio = (np.arange(height) / height)[:, None]
+        rows = (np.array(start_color[:3]) * (1 - ratio) + np.array(end_color[:3]) * ratio).astype(np.uint8)
         surface = pygame.Surface((width, height))
-        for y in range(height):
-            # Calculate gradient color
-            ratio = y / height
-            r = int(start_color[0] * (1 - ratio) + end_color[0] * ratio)
-            g = int(start_color[1] * (1 - ratio) + end_color[1] * ratio)
-            b = int(start_color[2] * (1 - ratio) + end_color[2] * ratio)
-            pygame.draw.line(surface, (r, g, b), (0, y), (width, y))
+        pygame.surfarray.blit_array(surface, np.broadcast_to(rows, (width, height, 3)))
+
+        self.gradient_cache[key] = surface
+        if len(self.gradient_cache) > GRADIENT_CACHE_SIZE:
+            self.gradient_cache.popitem(last=False)
         return surface
     
     def create_buttons(self):
@@ -168,8 +138,8 @@ class QuestionUI:
     
     def reset_available_questions(self):
         """Reset the available questions pool"""
-        self.available_questions = list(range(len(self.questions)))
-        random.shuffle(self.available_questions)
+        self.sampler.reset()
+        self.upcoming.clear()
 
     def show_random_question(self):
         """Show a random question that hasn't been asked recently"""
@@ -177,14 +147,12 @@ class QuestionUI:
         self.game_paused = True
         self.question_answered = False
         
-        # If we've used all questions, reset the pool
-        if not self.available_questions:
-            self.reset_available_questions()
-        
-        # Get a random question from available questions
-        question_index = self.available_questions.pop()
-        self.current_question = self.questions[question_index]
+        # Get a random question not asked since the pool last ran dry (it refills itself)
+        question_index = self.upcoming.popleft() if self.upcoming else self.sampler.draw()
+        self.current_question = questions.get(question_index)
         self.correct_answer = self.current_question["correct"]
+        self.question_layout(self.current_question)
+        self.prefetch_hints()
         self.selected_option = None
         self.show_feedback = False
         self.feedback_message = ""
@@ -228,7 +196,7 @@ class QuestionUI:
                     self.selected_option = i
                     self.question_answered = True
                     self.show_feedback = True
-                    self.feedback_timer = 60  # 1 second delay at 60 FPS
+                    self.feedback_timer = 60  # 1 second delay at 60 ticks per second
                     self.feedback_alpha = 0
                     # Set feedback message immediately
                     if i == self.correct_answer:
@@ -248,7 +216,7 @@ class QuestionUI:
                 self.selected_option = self.hover_index
                 self.question_answered = True
                 self.show_feedback = True
-                self.feedback_timer = 60  # 1 second delay at 60 FPS
+                self.feedback_timer = 60  # 1 second delay at 60 ticks per second
                 self.feedback_alpha = 0
                 # Set feedback message immediately
                 if self.hover_index == self.correct_answer:
@@ -271,7 +239,7 @@ class QuestionUI:
             self.selected_option = selected_option
             self.question_answered = True
             self.show_feedback = True
-            self.feedback_timer = 60  # 1 second delay at 60 FPS
+            self.feedback_timer = 60  # 1 second delay at 60 ticks per second
             if selected_option == self.current_question['correct']:
                 self.feedback_message = "🎉 Correct! " + self.current_question["explanation"]
                 return (True, self.ask_ai_clicked)
@@ -297,6 +265,49 @@ class QuestionUI:
         self.hover_index = -1
         self.ask_ai_clicked = False
     
+    def question_layout(self, question):
+        """Wrapped and rendered lines of a question and its options, with box heights.
+
+        Built once per question and font size and then reused every frame.
+        """
+        key = (question["question"], tuple(question["options"]), self.title_font.get_height(), self.font.get_height())
+        layout = self.layout_cache.get(key)
+        if layout is not None:
+            self.layout_cache.move_to_end(key)
+            return layout
+
+        question_lines = self.render_lines(question["question"], self.title_font, int(700 * SCALE_FACTOR))
+        options = []
+        for option in question["options"]:
+            option_lines = self.render_lines(option, self.font, int(600 * SCALE_FACTOR) - int(40 * SCALE_FACTOR))
+            option_height = len(option_lines) * self.font.get_height() + int(20 * SCALE_FACTOR)
+            options.append((option_lines, max(int(50 * SCALE_FACTOR), option_height)))
+
+        layout = {
+            "question_lines": question_lines,
+            "question_height": len(question_lines) * self.title_font.get_height() + int(40 * SCALE_FACTOR),
+            "options": options,
+            "alpha": None,  # alpha last applied to the rendered lines
+        }
+        self.layout_cache[key] = layout
+        if len(self.layout_cache) > LAYOUT_CACHE_SIZE:
+            self.layout_cache.popitem(last=False)
+        return layout
+
+    def render_lines(self, text, font, max_width):
+        return [font.render(line, True, self.colors['text']) for line in self.wrap_text(text, font, max_width)]
+
+    # set the fade-in alpha on every cached line of the layout, when it changes
+    def set_text_alpha(self, layout, alpha):
+        if alpha == layout["alpha"]:
+            return
+        for line_surface in layout["question_lines"]:
+            line_surface.set_alpha(alpha)
+        for option_lines, _ in layout["options"]:
+            for line_surface in option_lines:
+                line_surface.set_alpha(alpha)
+        layout["alpha"] = alpha
+
     def wrap_text(self, text, font, max_width):
         """Wrap text to fit within max_width"""
         words = text.split(' ')
@@ -363,36 +374,62 @@ class QuestionUI:
         button = Button(0, 0, button_surface)
         return button
 
+    def hint_path(self, question):
+        """Path of a question's hint image, relative paths being from the project root"""
+        image_path = question.get('image_path')
+        if image_path and not os.path.isabs(image_path):
+            image_path = os.path.join(Config.PROJECT_ROOT, image_path)
+        return image_path
+
+    def prefetch_hints(self):
+        """Decode the hint images of the current and next few questions in the background"""
+        while len(self.upcoming) < min(Config.HINT_PREFETCH, len(self.sampler) - 1):
+            self.upcoming.append(self.sampler.draw())
+
+        box = self.screen.get_size()
+        for question in [self.current_question] + [questions.get(i) for i in self.upcoming]:
+            image_path = self.hint_path(question)
+            if image_path:
+                self.hint_images.prefetch(image_path, box)
+
     def load_ai_image(self):
         if self.current_question and self.current_question.get('image_path'):
-            image_path = self.current_question['image_path']
-            print(f"Attempting to load image from: {image_path}")
-            if not os.path.exists(image_path):
-                print(f"Error: Image file does not exist at {image_path}")
+            # usually already decoded and scaled by prefetch_hints
+            img = self.hint_images.get(self.hint_path(self.current_question), self.screen.get_size())
+            if img is None:
                 return
-            try:
-                img = pygame.image.load(image_path)
-                # Scale image to fit screen while maintaining aspect ratio
-                screen_width = self.screen.get_width()
-                screen_height = self.screen.get_height()
-                img_width = img.get_width()
-                img_height = img.get_height()
-                scale = min(screen_width / img_width, screen_height / img_height) * 0.8
-                new_width = int(img_width * scale)
-                new_height = int(img_height * scale)
-                img = pygame.transform.scale(img, (new_width, new_height))
-                self.ai_image = img
-                self.ai_image_rect = img.get_rect(center=(screen_width // 2, screen_height // 2))
-                print(f"Successfully loaded image: {image_path}, size: {img.get_width()}x{img.get_height()}")
-            except Exception as e:
-                print(f"Error loading image: {self.current_question['image_path']}")
-                print(f"Exception: {str(e)}")
+            screen_width = self.screen.get_width()
+            screen_height = self.screen.get_height()
+            self.ai_image = img
+            self.ai_image_rect = img.get_rect(center=(screen_width // 2, screen_height // 2))
+
+    def tick(self):
+        """Advance the fades and the feedback delay by one simulation tick"""
+        # Smoothly fade in the overlay
+        if self.overlay_alpha < 200:
+            self.overlay_alpha = min(200, self.overlay_alpha + 40)
+        if self.showing_ai_image or not self.active or self.current_question is None:
+            return
+
+        # Update animation time
+        self.animation_time = (self.animation_time + 0.02) % (2 * math.pi)
+        
+        # Handle feedback timing
+        if self.question_answered and self.show_feedback:
+            if self.feedback_timer > 0:
+                self.feedback_timer -= 1
+                # Fade in during first half, fade out during second half
+                if self.feedback_timer > 30:
+                    self.feedback_alpha = min(255, self.feedback_alpha + 17)
+                else:
+                    self.feedback_alpha = max(0, self.feedback_alpha - 17)
+            else:
+                # Reset everything when feedback is complete
+                self.reset()  # This will handle both unpausing and resetting
 
     def draw(self):
         if self.showing_ai_image:
             # Draw overlay
-            if self.overlay_alpha < 200:
-                self.overlay_alpha = min(200, self.overlay_alpha + 40)
             self.overlay.set_alpha(self.overlay_alpha)
             self.screen.blit(self.overlay, (0, 0))
             # Determine image size and position
@@ -418,26 +455,6 @@ class QuestionUI:
         if not self.active or self.current_question is None:
             return
             
-        # Update animation time
-        self.animation_time = (self.animation_time + 0.02) % (2 * math.pi)
-        
-        # Handle feedback timing
-        if self.question_answered and self.show_feedback:
-            if self.feedback_timer > 0:
-                self.feedback_timer -= 1
-                # Fade in during first half, fade out during second half
-                if self.feedback_timer > 30:
-                    self.feedback_alpha = min(255, self.feedback_alpha + 17)
-                else:
-                    self.feedback_alpha = max(0, self.feedback_alpha - 17)
-            else:
-                # Reset everything when feedback is complete
-                self.reset()  # This will handle both unpausing and resetting
-                return
-        
-        # Smoothly fade in the overlay
-        if self.overlay_alpha < 200:
-            self.overlay_alpha = min(200, self.overlay_alpha + 40)
         self.overlay.set_alpha(self.overlay_alpha)
         self.screen.blit(self.overlay, (0, 0))
         
@@ -449,8 +466,8 @@ class QuestionUI:
         self.ask_ai_button.draw(self.screen)
         
         # Draw question box
-        question_lines = self.wrap_text(self.current_question["question"], self.title_font, int(700 * SCALE_FACTOR))
-        question_height = len(question_lines) * self.title_font.get_height() + int(40 * SCALE_FACTOR)
+        layout = self.question_layout(self.current_question)
+        question_height = layout["question_height"]
         
         question_box_width = int(700 * SCALE_FACTOR)
         question_box_x = (self.screen.get_width() - question_box_width) // 2
@@ -469,9 +486,8 @@ class QuestionUI:
         
         # Draw wrapped question text
         question_alpha = min(255, self.overlay_alpha * 2)
-        for i, line in enumerate(question_lines):
-            line_surface = self.title_font.render(line, True, self.colors['text'])
-            line_surface.set_alpha(question_alpha)
+        self.set_text_alpha(layout, question_alpha)
+        for i, line_surface in enumerate(layout["question_lines"]):
             line_rect = line_surface.get_rect(center=(self.screen.get_width() // 2,
                                                     question_box_y + int(20 * SCALE_FACTOR) + i * self.title_font.get_height()))
             self.screen.blit(line_surface, line_rect)
@@ -481,12 +497,7 @@ class QuestionUI:
         button_height = int(50 * SCALE_FACTOR)
         spacing = int(20 * SCALE_FACTOR)
         
-        for i, option in enumerate(self.current_question["options"]):
-            # Wrap option text
-            option_lines = self.wrap_text(option, self.font, button_width - int(40 * SCALE_FACTOR))
-            option_height = len(option_lines) * self.font.get_height() + int(20 * SCALE_FACTOR)
-            button_height = max(int(50 * SCALE_FACTOR), option_height)
-            
+        for i, (option_lines, button_height) in enumerate(layout["options"]):
             # Calculate button position
             button_x = (self.screen.get_width() - button_width) // 2
             button_y = self.screen.get_height() // 2 - int(50 * SCALE_FACTOR) + i * (button_height + spacing)
@@ -525,26 +536,27 @@ class QuestionUI:
                            (button_x, button_y, button_width, button_height), 2)
             
             # Draw wrapped option text
-            for j, line in enumerate(option_lines):
-                line_surface = self.font.render(line, True, self.colors['text'])
-                line_surface.set_alpha(question_alpha)
+            for j, line_surface in enumerate(option_lines):
                 line_rect = line_surface.get_rect(center=(self.screen.get_width() // 2,
                                                         button_y + int(10 * SCALE_FACTOR) + j * self.font.get_height()))
                 self.screen.blit(line_surface, line_rect)
         
         # Draw feedback message
         if self.question_answered and self.show_feedback and self.feedback_timer > 0:
-            feedback_lines = self.wrap_text(self.feedback_message, self.font, int(600 * SCALE_FACTOR))
-            feedback_height = len(feedback_lines) * self.font.get_height() + int(40 * SCALE_FACTOR)
+            # Wrap and render the message once, when it changes
+            if self.feedback_layout is None or self.feedback_layout[0] != self.feedback_message:
+                feedback_lines = self.render_lines(self.feedback_message, self.font, int(600 * SCALE_FACTOR))
+                feedback_height = len(feedback_lines) * self.font.get_height() + int(40 * SCALE_FACTOR)
+                self.feedback_layout = (self.feedback_message, feedback_lines,
+                                        pygame.Surface((int(600 * SCALE_FACTOR), feedback_height), pygame.SRCALPHA))
+            _, feedback_lines, feedback_surface = self.feedback_layout
             feedback_y = self.screen.get_height() // 2 + int(200 * SCALE_FACTOR)
             
-            # Create feedback surface with alpha
-            feedback_surface = pygame.Surface((int(600 * SCALE_FACTOR), feedback_height), pygame.SRCALPHA)
+            # Fill feedback surface with alpha
             feedback_surface.fill((0, 0, 0, int(self.feedback_alpha * 0.8)))
             
             # Draw feedback text
-            for i, line in enumerate(feedback_lines):
-                text = self.font.render(line, True, self.colors['text'])
+            for i, text in enumerate(feedback_lines):
                 text.set_alpha(int(self.feedback_alpha))
                 text_rect = text.get_rect(center=(int(300 * SCALE_FACTOR), int(20 * SCALE_FACTOR) + i * self.font.get_height()))
                 feedback_surface.blit(text, text_rect)
@@ -0,0 +1,200 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict, deque
+import pygame
+
+import Config
+
+class TextureCache():
+	"""Process-wide store of display-ready surfaces, keyed by (path, size, flip).
+
+	Each file is decoded once and converted to the display's pixel format
+	(when a window exists); every scaled or mirrored variant is built once and
+	shared by all sprites asking for it, across level loads and respawns.
+	Sprites packed by build_atlas.py are cut from the atlas page instead of
+	being opened one by one.
+	"""
+	def __init__(self, atlas_index=None):
+		self.atlas_index = atlas_index
+		self.atlas = None		# relative path -> atlas entry, read on first load
+		self.atlas_pages = []	# page file names
+		self.pages = {}			# page number -> decoded atlas page
+		self.images = {}		# path -> decoded image
+		self.surfaces = {}		# (path, size, flip) -> scaled/flipped surface
+		self.hits = 0
+		self.misses = 0
+
+	# read the atlas index, if one has been built
+	def load_atlas(self):
+		self.atlas = {}
+		if self.atlas_index and os.path.exists(self.atlas_index):
+			with open(self.atlas_index) as f:
+				index = json.load(f)
+			self.atlas_pages = index["pages"]
+			self.atlas = index["sprites"]
+
+	# cut path out of the atlas, or None if it is not packed (or changed since packing)
+	def atlas_image(self, path):
+		if self.atlas is None:
+			self.load_atlas()
+		if not self.atlas:
+			return None
+
+		atlas_dir = os.path.dirname(self.atlas_index)
+		entry = self.atlas.get(os.path.relpath(path, atlas_dir).replace(os.sep, "/"))
+		if entry is None or not os.path.exists(path) or os.path.getsize(path) != entry["bytes"]:
+			return None
+		# same size is not enough: a sprite edited since packing must be read from its file
+		with open(path, "rb") as f:
+			if hashlib.sha1(f.read()).hexdigest() != entry.get("sha1"):
+				return None
+
+		page = self.pages.get(entry["page"])
+		if page is None:
+			page = pygame.image.load(os.path.join(atlas_dir, self.atlas_pages[entry["page"]]))
+			if pygame.display.get_surface():
+				page = page.convert_alpha()
+			self.pages[entry["page"]] = page
+
+		img = page.subsurface(pygame.Rect(entry["rect"]))
+		# opaque sprites (the background) blit faster without an alpha channel
+		if entry["opaque"] and pygame.display.get_surface():
+			img = img.convert()
+		return img
+
+	# decode a file once, in display format if possible
+	def load(self, path):
+		img = self.images.get(path)
+		if img is not None:
+			return img
+
+		img = self.atlas_image(path)
+		if img is None:
+			img = pygame.image.load(path)
+			if pygame.display.get_surface():
+				img = img.convert_alpha() if img.get_flags() & pygame.SRCALPHA else img.convert()
+		self.images[path] = img
+		return img
+
+	# shared surface for path scaled to size and optionally mirrored horizontally
+	def get(self, path, size=None, flip=False):
+		if size is not None:
+			size = (int(size[0]), int(size[1]))
+		key = (path, size, flip)
+
+		surface = self.surfaces.get(key)
+		if surface is not None:
+			self.hits += 1
+			return surface
+
+		self.misses += 1
+		surface = self.load(path)
+		if size is not None:
+			surface = pygame.transform.scale(surface, size)
+		if flip:
+			surface = pygame.transform.flip(surface, True, False)
+		self.surfaces[key] = surface
+		return surface
+
+	def stats(self):
+		return {
+			"hits": self.hits,
+			"misses": self.misses,
+			"images": len(self.images),
+			"surfaces": len(self.surfaces),
+		}
+
+	def clear(self):
+		self.atlas = None
+		self.pages = {}
+		self.images = {}
+		self.surfaces = {}
+		self.hits = 0
+		self.misses = 0
+
+class ScaledImageCache():
+	"""Bounded LRU of images scaled to fit a box, decoded ahead of time on a background thread.
+
+	prefetch() queues an image without blocking; get() returns it, waiting for
+	a queued decode to finish, or decoding on the spot if it was never queued.
+	Images are keyed by (path, box), shrunk or grown to `fit` of the box with
+	their aspect ratio kept, and converted to the display format on first get().
+	Missing or unreadable files give None.
+	"""
+	def __init__(self, capacity=8, fit=0.8):
+		self.capacity = capacity
+		self.fit = fit
+		self.condition = threading.Condition()
+		self.images = OrderedDict()		# (path, box) -> [surface or None, converted]
+		self.queue = deque()			# keys waiting for the worker
+		self.loading = None				# key the worker is decoding
+		self.thread = None
+
+	def prefetch(self, path, box):
+		key = (path, tuple(box))
+		with self.condition:
+			if key in self.images or key in self.queue or key == self.loading:
+				return
+			self.queue.append(key)
+			if self.thread is None:
+				self.thread = threading.Thread(target=self.work, daemon=True)
+				self.thread.start()
+			self.condition.notify_all()
+
+	def get(self, path, box):
+		key = (path, tuple(box))
+		with self.condition:
+			# a decode in flight is waited for; one still queued is taken back and done here
+			if key in self.queue:
+				self.queue.remove(key)
+			while key == self.loading:
+				self.condition.wait()
+			entry = self.images.get(key)
+
+		if entry is None:
+			entry = [self.decode(*key), False]
+			self.store(key, entry)
+
+		# converting touches the display, so it happens here rather than on the worker
+		surface, converted = entry
+		if surface is not None and not converted and pygame.display.get_surface():
+			entry[0] = surface.convert_alpha() if surface.get_flags() & pygame.SRCALPHA else surface.convert()
+			entry[1] = True
+		with self.condition:
+			if key in self.images:
+				self.images.move_to_end(key)
+		return entry[0]
+
+	def decode(self, path, box):
+		try:
+			img = pygame.image.load(path)
+		except (pygame.error, FileNotFoundError) as e:
+			print(f"Error loading image: {path} ({e})")
+			return None
+		scale = min(box[0] / img.get_width(), box[1] / img.get_height()) * self.fit
+		return pygame.transform.scale(img, (int(img.get_width() * scale), int(img.get_height() * scale)))
+
+	def store(self, key, entry):
+		with self.condition:
+			self.images[key] = entry
+			self.images.move_to_end(key)
+			while len(self.images) > self.capacity:
+				self.images.popitem(last=False)
+
+	def work(self):
+		while True:
+			with self.condition:
+				while not self.queue:
+					self.condition.wait()
+				key = self.loading = self.queue.popleft()
+
+			entry = [self.decode(*key), False]
+			self.store(key, entry)
+			with self.condition:
+				self.loading = None
+				self.condition.notify_all()
+
+# shared by every sprite class
+textures = TextureCache(Config.ATLAS)
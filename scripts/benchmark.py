@@ -0,0 +1,219 @@
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+
+# benchmarks never open a window
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import numpy as np
+import pygame
+
+import Config
+import Levels
+import main
+from ChaserPolicy import load_policy
+from QuestionUI import QuestionUI
+
+# Times the game's hot paths one at a time under the SDL dummy driver and writes
+# the results as JSON; with --baseline, each result is compared against an
+# earlier run and slowdowns beyond --threshold are flagged (exit status 1):
+#   python benchmark.py [--out results.json] [--baseline baseline.json] [--only NAME]
+
+REPEAT = 5              # timed repeats per benchmark; the median is reported
+MIN_TIME = 0.2          # seconds each repeat runs for, at least
+THRESHOLD = 0.15        # relative slowdown reported as a regression
+PLAYTHROUGH = [[30, "d"], [20, "wd"], [40, "d"], [15, ""], [30, "wa"], [60, "d"]]   # scripted input for recorded states
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+# reset the level globals the way Simulation.load_level does
+def reset_level(level):
+    main.current_level = level
+    main.plats = [pygame.sprite.Group()]
+    main.check_points = [pygame.sprite.Group()]
+    main.lava_tiles = [pygame.sprite.Group()]
+    main.game_over = 0
+    main.game_finished = False
+
+# Each benchmark below prepares its state and returns (fn, calls): fn runs
+# `calls` operations, and results are reported per operation.
+
+def world_init(level):
+    def setup():
+        def fn():
+            reset_level(level)
+            main.World()
+        return fn, 1
+    return setup
+
+for level in range(len(Levels.level)):
+    benchmark(f"world_init_level{level}")(world_init(level))
+
+@benchmark("character_collision")
+def collision():
+    # record the (position, velocity, dx, dy) of every collision call in a short playthrough
+    sim = main.Simulation(0, seed=0)
+    player = sim.player
+    states = []
+    resolve = player.collision
+
+    def record(dx, dy):
+        states.append((player.rect.topleft, player.vel_y, dx, dy))
+        return resolve(dx, dy)
+
+    player.collision = record
+    keys = main.ScriptedInput(PLAYTHROUGH).frames()
+    for _ in range(sum(frames for frames, _ in PLAYTHROUGH)):
+        if sim.outcome() is not None:
+            break
+        sim.step(next(keys))
+    player.collision = resolve
+
+    def fn():
+        for position, vel_y, dx, dy in states:
+            player.rect.topleft = position
+            player.vel_y = vel_y
+            player.collision(dx, dy)
+        main.game_over = 0
+        main.game_finished = False
+    return fn, len(states)
+
+def chaser_update(policy_kind):
+    def setup():
+        sim = main.Simulation(0, seed=0)
+        chaser = sim.chaser
+        chaser.policy = load_policy(policy_kind) if policy_kind else None
+        if policy_kind and chaser.policy is None:
+            return None
+        chaser.is_active = True
+        start = chaser.rect.topleft
+
+        def fn():
+            chaser.rect.topleft = start
+            chaser.update(sim.player, False, 0)
+        return fn, 1
+    return setup
+
+benchmark("chaser_update_heuristic")(chaser_update(None))
+benchmark("chaser_update_model")(chaser_update("auto"))
+
+def question_ui():
+    ui = QuestionUI(main.screen)
+    ui.show_random_question()
+    return ui
+
+@benchmark("question_draw")
+def question_draw():
+    ui = question_ui()
+    return ui.draw, 1
+
+# an option-button gradient, built from scratch (cache cleared each call) or served from the cache
+def question_gradient(cached):
+    def setup():
+        ui = question_ui()
+        width, height = int(600 * Config.SCALE_FACTOR), int(50 * Config.SCALE_FACTOR)
+        start, end = ui.colors['option_gradient_start'], ui.colors['option_gradient_end']
+
+        def fn():
+            if not cached:
+                ui.gradient_cache.clear()
+            ui.create_gradient_surface(width, height, start, end, 30)
+        return fn, 1
+    return setup
+
+benchmark("question_gradient")(question_gradient(False))
+benchmark("question_gradient_hit")(question_gradient(True))
+
+@benchmark("headless_frame")
+def headless_frame():
+    state = {"sim": main.Simulation(0, seed=0)}
+    keys = main.ScriptedInput(PLAYTHROUGH * 100).frames()
+
+    def fn():
+        sim = state["sim"]
+        if sim.outcome() is not None:
+            sim.chaser.close()
+            sim = state["sim"] = main.Simulation(0, seed=0)
+        sim.step(next(keys))
+    return fn, 1
+
+# median and best microseconds per operation
+def measure(fn, calls, repeat=REPEAT):
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < MIN_TIME:
+        number *= 2
+    runs = np.array(timer.repeat(repeat, number)) / (number * calls) * 1e6
+    return {"median_us": float(np.median(runs)), "min_us": float(runs.min()), "runs": number * repeat}
+
+def run_benchmarks(only=None, repeat=REPEAT):
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        prepared = setup()
+        if prepared is None:
+            print(f"{name:<26} skipped (no trained policy found)")
+            continue
+        results[name] = measure(*prepared, repeat=repeat)
+        print(f"{name:<26} {results[name]['median_us']:12.2f} us")
+    return results
+
+# names of results slower than the baseline by more than threshold
+def compare(results, baseline, threshold=THRESHOLD):
+    regressions = []
+    print(f"\n{'benchmark':<26} {'baseline':>12} {'now':>12} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, now = baseline[name]["median_us"], result["median_us"]
+        change = now / before - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{name:<26} {before:12.2f} {now:12.2f} {change:+8.1%}{flag}")
+    return regressions
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "chaser_policy": Config.CHASER_POLICY,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths")
+    parser.add_argument("--out", default="benchmark_results.json", help="where to write the results")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="relative slowdown flagged as a regression")
+    parser.add_argument("--only", nargs="*", help="run only benchmarks whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    args = parser.parse_args()
+
+    main.init_display()
+    results = run_benchmarks(args.only, args.repeat)
+    with open(args.out, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=1)
+    print(f"Wrote {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
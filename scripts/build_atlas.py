@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+import math
+import hashlib
+import numpy as np
+import pygame
+
+import Config
+
+# Packs the images in Config.Sprites and Config.Player into one or a few atlas
+# pages plus a JSON index of sub-rects, so the game decodes a single PNG at
+# startup instead of opening each sprite. Re-run after changing any sprite:
+#   python build_atlas.py
+
+PAGE_SIZE = 2048    # maximum width/height of one atlas page
+PADDING = 1         # empty pixels between packed sprites
+
+# The background is one full-screen, JPEG-compressed photo: it is already a
+# single decode, and re-encoding it into a PNG page would make startup slower.
+EXCLUDE = ["background"]
+
+def source_paths():
+    paths = []
+    for group in (Config.Sprites, Config.Player):
+        for name, path in group.items():
+            if name not in EXCLUDE and path not in paths:
+                paths.append(path)
+    return paths
+
+def rgba_pixels(image):
+    # RGB plus an alpha plane; colorkeyed palette sprites become fully transparent where keyed
+    rgb = pygame.surfarray.array3d(image)
+    if image.get_flags() & pygame.SRCALPHA:
+        alpha = pygame.surfarray.array_alpha(image)
+    elif image.get_colorkey() is not None:
+        alpha = pygame.surfarray.array_colorkey(image)
+    else:
+        alpha = np.full(image.get_size(), 255, dtype=np.uint8)
+    return rgb, alpha
+
+# the game compares this against the sprite on disk, so an edited sprite is never served from a stale atlas
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def pack(sizes):
+    # shelf packing, tallest first: returns {index: (page, x, y)}
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placements = {}
+    page, x, y, shelf_height = 0, 0, 0, 0
+
+    # aim for roughly square pages: empty atlas area still costs decode time
+    area = sum((w + PADDING) * (h + PADDING) for w, h in sizes)
+    width = min(PAGE_SIZE, max(max(w for w, h in sizes), math.ceil(math.sqrt(area) * 1.1)))
+
+    for i in order:
+        w, h = sizes[i]
+        if w > PAGE_SIZE or h > PAGE_SIZE:
+            raise ValueError(f"sprite of size {w}x{h} does not fit on a {PAGE_SIZE} page")
+
+        # start a new shelf, then a new page, when the sprite does not fit
+        if x + w > width:
+            x, y, shelf_height = 0, y + shelf_height + PADDING, 0
+        if y + h > PAGE_SIZE:
+            page, x, y, shelf_height = page + 1, 0, 0, 0
+
+        placements[i] = (page, x, y)
+        x += w + PADDING
+        shelf_height = max(shelf_height, h)
+
+    return placements
+
+def build_atlas(index_path=Config.ATLAS):
+    atlas_dir = os.path.dirname(index_path)
+    paths = source_paths()
+    images = [pygame.image.load(path) for path in paths]
+    placements = pack([image.get_size() for image in images])
+
+    # size every page to the extent actually used
+    extents = {}
+    for i, (page, x, y) in placements.items():
+        w, h = images[i].get_size()
+        used_w, used_h = extents.get(page, (0, 0))
+        extents[page] = (max(used_w, x + w), max(used_h, y + h))
+
+    pages = [pygame.Surface(extents[page], pygame.SRCALPHA) for page in sorted(extents)]
+    for page in pages:
+        page.fill((0, 0, 0, 0))
+
+    sprites = {}
+    for i, (page, x, y) in placements.items():
+        image = images[i]
+        w, h = image.get_size()
+        rgb, alpha = rgba_pixels(image)
+
+        pixels = pygame.surfarray.pixels3d(pages[page])
+        pixels[x:x + w, y:y + h] = rgb
+        del pixels
+        pixels = pygame.surfarray.pixels_alpha(pages[page])
+        pixels[x:x + w, y:y + h] = alpha
+        del pixels
+
+        key = os.path.relpath(paths[i], atlas_dir).replace(os.sep, "/")
+        sprites[key] = {
+            "page": page,
+            "rect": [x, y, w, h],
+            "opaque": bool((alpha == 255).all()),
+            "bytes": os.path.getsize(paths[i]),
+            "sha1": file_digest(paths[i]),
+        }
+
+    base = os.path.splitext(os.path.basename(index_path))[0]
+    page_files = []
+    for n, page in enumerate(pages):
+        name = f"{base}_{n}.png"
+        pygame.image.save(page, os.path.join(atlas_dir, name))
+        page_files.append(name)
+        print(f"Packed page {name}: {page.get_width()}x{page.get_height()}")
+
+    with open(index_path, "w") as f:
+        json.dump({"pages": page_files, "sprites": sprites}, f, indent=1, sort_keys=True)
+
+    print(f"Packed {len(sprites)} sprites into {len(pages)} page(s), index: {index_path}")
+
+if __name__ == "__main__":
+    build_atlas(sys.argv[1] if len(sys.argv) > 1 else Config.ATLAS)
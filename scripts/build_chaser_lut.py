@@ -0,0 +1,60 @@
+import sys
+import numpy as np
+
+import Config
+from ChaserPolicy import LookupPolicy, load_policy
+
+# Samples the trained chaser policy on a dense (dx, dy, distance) grid and saves
+# it as a lookup table, so the game can run the chaser with CHASER_POLICY = "lut"
+# and no ML runtime at all:
+#   python build_chaser_lut.py [numpy|keras]
+
+GRID = (33, 33, 65)     # samples along dx, dy and distance
+MAX_DISTANCE = 1000     # the player is kept within x <= 977 and y < 1000 pixels
+BATCH = 65536           # states evaluated per policy call
+
+def grid_axes(shape=GRID, max_distance=MAX_DISTANCE):
+    dx = np.linspace(-1, 1, shape[0], dtype=np.float32)
+    dy = np.linspace(-1, 1, shape[1], dtype=np.float32)
+    # the policy bends sharply close to the player, so distances are spaced quadratically:
+    # sub-pixel steps next to the player, ~30 px steps across the screen
+    distance = (max_distance * np.linspace(0, 1, shape[2]) ** 2).astype(np.float32)
+    return dx, dy, distance
+
+def grid_states(axes):
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+
+def evaluate(policy, states):
+    return np.concatenate([policy.predict(states[i:i + BATCH]) for i in range(0, len(states), BATCH)])
+
+def game_states(n, rng, max_distance=MAX_DISTANCE):
+    # the chaser divides by max(|dx|, |dy|), so one of dx, dy is always +-1
+    angle = rng.uniform(0, 2 * np.pi, n)
+    direction = np.stack([np.cos(angle), np.sin(angle)], axis=1)
+    direction /= np.abs(direction).max(axis=1, keepdims=True)
+    distance = rng.uniform(0, max_distance, n)
+    return np.column_stack([direction, distance]).astype(np.float32)
+
+def max_error(policy, lut, states):
+    return float(np.max(np.abs(evaluate(policy, states) - lut.predict(states))))
+
+def build_lut(kind="auto", path=Config.Models["chaser_lut"]):
+    policy = load_policy(kind)
+    if policy is None:
+        raise SystemExit("No trained chaser policy found to sample")
+
+    dx, dy, distance = grid_axes()
+    states = grid_states((dx, dy, distance))
+    table = evaluate(policy, states).reshape(GRID + (-1,))
+    np.savez(path, table=table, dx=dx, dy=dy, distance=distance)
+    print(f"Sampled {len(states)} states into {path}")
+
+    # report the interpolation error against the live model, off the grid points
+    rng = np.random.default_rng(0)
+    lut = LookupPolicy(path)
+    anywhere = rng.uniform([-1, -1, 0], [1, 1, MAX_DISTANCE], (100000, 3)).astype(np.float32)
+    print(f"Max error, whole range:  {max_error(policy, lut, anywhere):.4f}")
+    print(f"Max error, game states:  {max_error(policy, lut, game_states(100000, rng)):.4f}")
+
+if __name__ == "__main__":
+    build_lut(sys.argv[1] if len(sys.argv) > 1 else "auto")
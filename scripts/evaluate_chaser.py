@@ -0,0 +1,126 @@
+import os
+import time
+import argparse
+import numpy as np
+from multiprocessing import Pool
+
+import Config
+import Levels
+from ChaserPolicy import load_policy
+from generate_rollouts import random_walk
+
+# Scores a chaser policy by running seeded headless episodes of every level,
+# with the player on random-walk inputs, spread over a process pool:
+#   python evaluate_chaser.py [--policy auto|numpy|keras|lut|heuristic] [--model PATH] [--episodes N]
+# Reports catch rate, time-to-catch percentiles (counted from when the chaser wakes)
+# and policy inference cost per step.
+
+EPISODES_PER_LEVEL = 50
+PERCENTILES = [50, 90, 99]
+
+# Config.Models entry holding each policy kind's file
+MODEL_FILES = {"keras": "chaser", "numpy": "chaser_weights", "lut": "chaser_lut"}
+
+# policy kind that loads a model file, from its extension and, for .npz, its contents
+def model_kind(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".h5", ".keras"):
+        return "keras"
+    if extension == ".npz":
+        with np.load(path) as data:
+            return "lut" if "table" in data.files else "numpy"
+    raise ValueError(f"can't tell which policy loads {path}; pass --policy numpy, keras or lut")
+
+class TimedPolicy():
+    """Wraps a policy and accumulates how many predict calls it served and how long they took."""
+    def __init__(self, policy):
+        self.policy = policy
+        self.calls = 0
+        self.seconds = 0.0
+
+    def predict(self, states):
+        start = time.perf_counter()
+        actions = self.policy.predict(states)
+        self.seconds += time.perf_counter() - start
+        self.calls += 1
+        return actions
+
+policy = None   # the worker's policy, loaded once per process
+
+def init_worker(kind, model):
+    global policy
+
+    if model and kind in MODEL_FILES:
+        Config.Models[MODEL_FILES[kind]] = model
+    loaded = load_policy(kind)
+    policy = TimedPolicy(loaded) if loaded is not None else None
+
+    # chasers are built without a policy and handed the shared one, so it is not reloaded per episode
+    Config.CHASER_POLICY = "heuristic"
+    Config.CHASER_ASYNC = False
+
+def run_episode(task):
+    from main import Simulation, ScriptedInput
+
+    level, seed = task
+    sim = Simulation(level, seed=seed)
+    sim.chaser.policy = policy
+    calls, seconds = (policy.calls, policy.seconds) if policy else (0, 0.0)
+
+    keys = ScriptedInput(random_walk(np.random.default_rng(seed), sim.max_frames)).frames()
+    woke = None     # frame the chaser became active; the start delay is not the policy's doing
+    while sim.outcome() is None:
+        sim.step(next(keys))
+        if woke is None and sim.chaser.is_active:
+            woke = sim.frame
+    sim.chaser.close()
+
+    if policy:
+        calls, seconds = policy.calls - calls, policy.seconds - seconds
+    chase_time = (sim.frame - woke) / sim.fps if woke is not None else None
+    return level, sim.outcome(), chase_time, calls, seconds
+
+def summarize(name, results):
+    outcomes = [r[1] for r in results]
+    catch_times = [r[2] for r in results if r[1] == "caught"]
+    calls = sum(r[3] for r in results)
+    seconds = sum(r[4] for r in results)
+
+    counts = ", ".join(f"{o} {outcomes.count(o)}" for o in sorted(set(outcomes)))
+    line = f"{name:>6}: catch rate {outcomes.count('caught') / len(outcomes):6.1%} ({counts})"
+    if catch_times:
+        p = np.percentile(catch_times, PERCENTILES)
+        line += " - time to catch after wake-up " + " ".join(f"p{q} {t:.1f}s" for q, t in zip(PERCENTILES, p))
+    if calls:
+        line += f" - {seconds / calls * 1e6:.1f} us/step"
+    print(line)
+
+def evaluate(kind="auto", model=None, episodes=EPISODES_PER_LEVEL, workers=None, seed=0):
+    if model:
+        if kind == "heuristic":
+            raise ValueError("--model has no effect with --policy heuristic")
+        if kind == "auto":
+            kind = model_kind(model)
+        print(f"Loading {model} as a '{kind}' policy")
+
+    levels = range(len(Levels.level))
+    tasks = [(level, seed + level * episodes + i) for level in levels for i in range(episodes)]
+
+    print(f"Evaluating policy '{kind}' over {episodes} episodes on each of {len(levels)} levels...")
+    with Pool(workers, initializer=init_worker, initargs=(kind, model)) as pool:
+        results = pool.map(run_episode, tasks, chunksize=max(1, episodes // 4))
+
+    for level in levels:
+        summarize(f"level {level}", [r for r in results if r[0] == level])
+    summarize("all", results)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure how well a chaser policy catches the player")
+    parser.add_argument("--policy", default=Config.CHASER_POLICY, choices=["auto", "numpy", "keras", "lut", "heuristic"])
+    parser.add_argument("--model", help="model file to score; with --policy auto its kind comes from the file (default: from Config.Models)")
+    parser.add_argument("--episodes", type=int, default=EPISODES_PER_LEVEL, help="episodes per level")
+    parser.add_argument("--workers", type=int, help="processes to run (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    evaluate(args.policy, args.model, args.episodes, args.workers, args.seed)
@@ -0,0 +1,43 @@
+import sys
+import numpy as np
+import tensorflow as tf
+
+import Config
+from ChaserPolicy import NumpyPolicy, export_weights
+
+# Exports the trained chaser model to a NumPy weight file the game can run
+# without TensorFlow, then checks both give the same actions:
+#   python export_chaser.py [model.h5] [weights.npz]
+
+TOLERANCE = 1e-4    # max allowed difference between Keras and NumPy actions
+
+def random_states(n, seed=0):
+    # states as the game produces them: unit dx/dy and a pixel distance
+    rng = np.random.default_rng(seed)
+    states = np.empty((n, 3), dtype=np.float32)
+    states[:, :2] = rng.uniform(-1, 1, (n, 2))
+    states[:, 2] = rng.uniform(0, 1000, n)
+    return states
+
+def verify_export(model, weights_path, n=10000):
+    states = random_states(n)
+    expected = model.predict(states, batch_size=1024, verbose=0)
+    actual = NumpyPolicy(weights_path).predict(states)
+    return float(np.max(np.abs(expected - actual)))
+
+def main():
+    model_path = sys.argv[1] if len(sys.argv) > 1 else Config.Models["chaser"]
+    weights_path = sys.argv[2] if len(sys.argv) > 2 else Config.Models["chaser_weights"]
+
+    model = tf.keras.models.load_model(model_path, compile=False)
+    export_weights(model, weights_path)
+    print(f"Exported {model_path} to {weights_path}")
+
+    error = verify_export(model, weights_path)
+    print(f"Max difference against Keras: {error:.2e}")
+    if error > TOLERANCE:
+        print(f"Export does not match the Keras model (tolerance {TOLERANCE})")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
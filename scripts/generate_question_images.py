@@ -1,75 +1,126 @@
 from PIL import Image, ImageDraw
 import os
+import json
+import time
 import random
+import hashlib
+import argparse
 import colorsys
+from multiprocessing import Pool
 
-def generate_random_color():
+import Config
+from QuestionBank import QuestionBank
+
+# Draws a placeholder hint image for every image_path in the question bank,
+# spread over a process pool. Each image is drawn from a seed derived from its
+# path, so a given path always gets the same picture. A manifest records the
+# parameters and content hash of every image written; images whose parameters
+# match and whose file is unchanged on disk are skipped:
+#   python generate_question_images.py [--bank questions.jsonl] [--workers N] [--force]
+
+IMAGE_SIZE = (400, 300)
+MANIFEST = os.path.join(Config.PROJECT_ROOT, "sprites", "questions", "manifest.json")
+STYLE = 1       # bump when create_question_image changes, to redraw every image
+
+def generate_random_color(rng):
     # Generate a random color in HSV space and convert to RGB
-    h = random.random()  # Random hue
-    s = 0.5 + random.random() * 0.5  # Saturation between 0.5 and 1.0
-    v = 0.5 + random.random() * 0.5  # Value between 0.5 and 1.0
+    h = rng.random()  # Random hue
+    s = 0.5 + rng.random() * 0.5  # Saturation between 0.5 and 1.0
+    v = 0.5 + rng.random() * 0.5  # Value between 0.5 and 1.0
     rgb = colorsys.hsv_to_rgb(h, s, v)
     return tuple(int(x * 255) for x in rgb)
 
-def create_question_image(filename, width=400, height=300):
+def create_question_image(filename, width=400, height=300, rng=random):
     # Create a new image with a white background
     image = Image.new('RGB', (width, height), 'white')
     draw = ImageDraw.Draw(image)
-    
+
     # Generate a random number of rectangles (between 3 and 7)
-    num_rectangles = random.randint(3, 7)
-    
+    num_rectangles = rng.randint(3, 7)
+
     # Draw random rectangles
     for _ in range(num_rectangles):
         # Random position and size
-        x1 = random.randint(0, width-100)
-        y1 = random.randint(0, height-100)
-        x2 = x1 + random.randint(50, 100)
-        y2 = y1 + random.randint(50, 100)
-        
+        x1 = rng.randint(0, width-100)
+        y1 = rng.randint(0, height-100)
+        x2 = x1 + rng.randint(50, 100)
+        y2 = y1 + rng.randint(50, 100)
+
         # Random color
-        color = generate_random_color()
-        
+        color = generate_random_color(rng)
+
         # Draw rectangle
         draw.rectangle([x1, y1, x2, y2], fill=color, outline='black')
-    
+
     # Create the directory if it doesn't exist
     os.makedirs(os.path.dirname(filename), exist_ok=True)
-    
+
     # Save the image
     image.save(filename)
 
-def main():
-    # List of image paths from QuestionUI.py
-    image_paths = [
-        "sprites/questions/lease_machinery.png",
-        "sprites/questions/equipment_security.png",
-        "sprites/questions/industrial_machines.png",
-        "sprites/questions/leasing_benefit.png",
-        "sprites/questions/construction_company.png",
-        "sprites/questions/leasing_preference.png",
-        "sprites/questions/lease_end.png",
-        "sprites/questions/asset_security.png",
-        "sprites/questions/asset_loan.png",
-        "sprites/questions/unpaid_invoices.png",
-        "sprites/questions/business_assets.png",
-        "sprites/questions/asset_secured_loan.png",
-        "sprites/questions/inventory_loan.png",
-        "sprites/questions/loan_default.png",
-        "sprites/questions/letters_of_credit.png",
-        "sprites/questions/foreign_payment.png",
-        "sprites/questions/trade_trust.png",
-        "sprites/questions/trade_finance.png",
-        "sprites/questions/trade_risks.png",
-        "sprites/questions/receivables_finance.png"
-    ]
-    
-    # Generate images for each path
-    for path in image_paths:
-        print(f"Generating {path}...")
-        create_question_image(path)
-    
+def image_seed(path, seed=0):
+    # from the path rather than the bank order, so adding a question leaves the other images alone
+    return int.from_bytes(hashlib.sha1(f"{seed}:{path}".encode()).digest()[:8], "little")
+
+def file_digest(filename):
+    with open(filename, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+# image paths used by the bank, each once, in bank order
+def bank_image_paths(bank):
+    paths = {}
+    for question in bank:
+        if question.get("image_path"):
+            paths[question["image_path"]] = None
+    return list(paths)
+
+def render_image(task):
+    path, params = task
+    filename = os.path.join(Config.PROJECT_ROOT, path)
+    create_question_image(filename, params["width"], params["height"], random.Random(params["seed"]))
+    return path, file_digest(filename)
+
+def up_to_date(path, params, entry):
+    filename = os.path.join(Config.PROJECT_ROOT, path)
+    return (entry is not None and entry["params"] == params and os.path.exists(filename)
+            and file_digest(filename) == entry["sha1"])
+
+def load_manifest(path=MANIFEST):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def main(bank_path=Config.QUESTION_BANK, workers=None, seed=0, force=False, manifest_path=MANIFEST):
+    manifest = load_manifest(manifest_path)
+    tasks = []
+    paths = bank_image_paths(QuestionBank(bank_path))
+    for path in paths:
+        params = {"width": IMAGE_SIZE[0], "height": IMAGE_SIZE[1], "seed": image_seed(path, seed), "style": STYLE}
+        if force or not up_to_date(path, params, manifest.get(path)):
+            tasks.append((path, params))
+
+    print(f"{len(paths)} images in the bank, {len(paths) - len(tasks)} up to date, {len(tasks)} to generate")
+    if tasks:
+        start = time.perf_counter()
+        params = dict(tasks)
+        with Pool(workers) as pool:
+            for path, digest in pool.imap_unordered(render_image, tasks, chunksize=max(1, len(tasks) // 64)):
+                manifest[path] = {"params": params[path], "sha1": digest}
+
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        print(f"Generated {len(tasks)} images in {time.perf_counter() - start:.1f}s")
+
     print("All images generated successfully!")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate placeholder hint images for the question bank")
+    parser.add_argument("--bank", default=Config.QUESTION_BANK, help="question bank to read image paths from")
+    parser.add_argument("--workers", type=int, help="processes to run (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="changes every image when changed")
+    parser.add_argument("--force", action="store_true", help="redraw every image, changed or not")
+    parser.add_argument("--manifest", default=MANIFEST, help="record of the images already generated")
+    args = parser.parse_args()
+
+    main(args.bank, args.workers, args.seed, args.force, args.manifest)
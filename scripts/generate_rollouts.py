@@ -0,0 +1,103 @@
+import os
+import argparse
+import numpy as np
+from multiprocessing import Pool
+
+import Config
+import Levels
+
+# Records chaser training data from simulated playthroughs of every level. The
+# player follows random-walk inputs; once the chaser wakes after its usual start
+# delay, every (dx, dy, distance) state it sees is saved with the direct-chase
+# action as its target.
+# Work is split into shards, one .npz per shard, spread over a process pool:
+#   python generate_rollouts.py [--workers N] [--shards-per-worker N] [--samples N]
+# train_chaser.py --rollouts DIR trains on the result.
+
+ROLLOUT_DIR = "rollouts"        # where shards are written, relative to the working directory
+SAMPLES_PER_SHARD = 20000       # recorded states per shard
+SHARDS_PER_WORKER = 4           # shards queued per pool process
+MAX_EPISODES = 10000            # episodes per shard at most; states are only recorded once the chaser
+                                # wakes, which random walks on some levels rarely live to see
+KEY_CHOICES = ["", "a", "d", "w", "wa", "wd", "d", "wd"]   # random-walk inputs, biased to the right
+SEGMENT_FRAMES = (10, 60)       # how long each random-walk input is held
+
+def init_worker():
+    # rollouts record the direct-chase heuristic, so no trained policy is loaded
+    Config.CHASER_POLICY = "heuristic"
+
+def random_walk(rng, frames):
+    segments = []
+    while frames > 0:
+        length = int(rng.integers(*SEGMENT_FRAMES))
+        segments.append([length, KEY_CHOICES[rng.integers(len(KEY_CHOICES))]])
+        frames -= length
+    return segments
+
+# state and target action of a chaser, as computed in Chaser.move
+def chase_state(chaser, player):
+    dx = player.rect.x - chaser.rect.x
+    dy = player.rect.y - chaser.rect.y
+
+    distance = max(abs(dx), abs(dy))
+    if distance > 0:
+        dx = dx / distance
+        dy = dy / distance
+    return (dx, dy, distance), (dx, dy)
+
+def rollout_shard(task):
+    """Plays seeded random-walk episodes on one level until the shard is full and saves it."""
+    from main import Simulation, ScriptedInput
+
+    level, seed, samples, max_episodes, path = task
+    rng = np.random.default_rng(seed)
+    states = np.empty((samples, 3), dtype=np.float32)
+    actions = np.empty((samples, 2), dtype=np.float32)
+
+    n = 0
+    episode = 0
+    while n < samples and episode < max_episodes:
+        # states are measured from chaser.rect, so every level is played with a single bird
+        sim = Simulation(level, seed=seed * 1000 + episode, chasers=1)
+        keys = ScriptedInput(random_walk(rng, sim.max_frames)).frames()
+        while n < samples and sim.outcome() is None:
+            if sim.chaser.is_active:
+                states[n], actions[n] = chase_state(sim.chaser, sim.player)
+                n += 1
+            sim.step(next(keys))
+        sim.chaser.close()
+        episode += 1
+
+    if n < samples:
+        print(f"Warning: level {level} gave only {n} of {samples} states in {episode} episodes; {path} is short")
+    np.savez(path, states=states[:n], actions=actions[:n], level=level, seed=seed)
+    return path, episode
+
+def generate_rollouts(directory=ROLLOUT_DIR, workers=None, shards_per_worker=SHARDS_PER_WORKER,
+                      samples=SAMPLES_PER_SHARD, seed=0, max_episodes=MAX_EPISODES):
+    workers = workers or os.cpu_count()
+    os.makedirs(directory, exist_ok=True)
+
+    # shards cycle through the levels so every level is covered evenly
+    levels = len(Levels.level)
+    tasks = [(i % levels, seed + i, samples, max_episodes, os.path.join(directory, f"shard_{i:04d}.npz"))
+             for i in range(workers * shards_per_worker)]
+
+    print(f"Recording {len(tasks)} shards of {samples} states on {workers} processes...")
+    with Pool(workers, initializer=init_worker) as pool:
+        for path, episodes in pool.imap_unordered(rollout_shard, tasks):
+            print(f"Wrote {path} ({episodes} episodes)")
+
+    print(f"Recorded up to {len(tasks) * samples} states into {directory}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record chaser training data from simulated playthroughs")
+    parser.add_argument("--out", default=ROLLOUT_DIR)
+    parser.add_argument("--workers", type=int, help="processes to run (default: all cores)")
+    parser.add_argument("--shards-per-worker", type=int, default=SHARDS_PER_WORKER)
+    parser.add_argument("--samples", type=int, default=SAMPLES_PER_SHARD, help="states per shard")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-episodes", type=int, default=MAX_EPISODES, help="episodes per shard at most")
+    args = parser.parse_args()
+
+    generate_rollouts(args.out, args.workers, args.shards_per_worker, args.samples, args.seed, args.max_episodes)
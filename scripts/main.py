@@ -1,7 +1,12 @@
+import os
+import sys
 import Config
 import Levels
 from Button import Button
 from QuestionUI import QuestionUI
+from Textures import textures
+from Profiler import FrameProfiler
+from ChaserPolicy import AsyncPolicy, load_policy
 from Config import SCALE_FACTOR
 
 import random
@@ -12,10 +17,8 @@ import heapq
 import math
 import numpy as np
 import json
-import os
 import traceback  # Add traceback for better error reporting
-import tensorflow as tf
-import sys
+from collections import defaultdict
 
 # ------------ Globals ------------
 
@@ -24,10 +27,9 @@ screen_width = int(1000 * SCALE_FACTOR) 			# screen width
 screen_height = int(900 * SCALE_FACTOR) 			# screen height
 tile_size = int(50 * SCALE_FACTOR)				# tile size
 world_tiles = []				# first layer
+tile_grid = None				# spatial index over world_tiles
 
-pygame.init()
-screen = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption('Mazer')
+screen = None					# display surface, created by init_display()
 
 in_menu = True
 game_finished = False
@@ -38,21 +40,25 @@ score_count = 0					# coin score count
 points = 0                      # points for correct answers
 POINTS_THRESHOLD = 20           # minimum points needed to progress
 
-	# --> Sounds
-pygame.mixer.pre_init(44100, -16, 2, 512)
-mixer.init()
-
 plats = []			# group of platforms
 check_points = []	# group of checkpoints
 lava_tiles = []		# group of lava tiles
+check_grid = None	# spatial index over checkpoints
+lava_grid = None	# spatial index over lava tiles
+
+# -----------------------------------------------------------------------------------------------------------
+
+# where to draw a sprite that moved from previous to current over the last tick, alpha of the way along
+def interpolate(previous, current, alpha):
+	return (round(previous[0] + (current[0] - previous[0]) * alpha),
+			round(previous[1] + (current[1] - previous[1]) * alpha))
 
 # -----------------------------------------------------------------------------------------------------------
 
 class CheckPoint(pygame.sprite.Sprite):
 	def __init__(self, x, y, screen):
 		pygame.sprite.Sprite.__init__(self)
-		img = pygame.image.load(Config.Sprites["sign"])
-		self.image = pygame.transform.scale(img, (int(tile_size // 1.3), int(tile_size // 1.3)) )
+		self.image = textures.get(Config.Sprites["sign"], (int(tile_size // 1.3), int(tile_size // 1.3)))
 		self.rect = self.image.get_rect()
 		self.rect.x = x
 		self.rect.y = y + 63 # adjust the height to go ontop of grass
@@ -62,8 +68,7 @@ class CheckPoint(pygame.sprite.Sprite):
 class Lava(pygame.sprite.Sprite):
 	def __init__(self, x, y, screen):
 		pygame.sprite.Sprite.__init__(self)
-		img = pygame.image.load(Config.Sprites["lava"])
-		self.image = pygame.transform.scale(img, (tile_size, tile_size))
+		self.image = textures.get(Config.Sprites["lava"], (tile_size, tile_size))
 		self.rect = self.image.get_rect()
 		self.rect.x = x
 		self.rect.y = y
@@ -74,8 +79,7 @@ class Platform(pygame.sprite.Sprite):
 	def __init__(self, x, y, move_x, move_y, screen):
 		self.screen = screen
 		pygame.sprite.Sprite.__init__(self)
-		img = pygame.image.load(Config.Sprites["ground_2"])
-		self.image = pygame.transform.scale(img, (tile_size, tile_size // 2))
+		self.image = textures.get(Config.Sprites["ground_2"], (tile_size, tile_size // 2))
 
 		self.rect = self.image.get_rect()
 		self.rect.x = x
@@ -87,6 +91,7 @@ class Platform(pygame.sprite.Sprite):
 		self.move_x = move_x # flag to move in x direction
 		self.move_y = move_y # flag to move in y direction
 		self.question_shown = False  # Flag to track if question has been shown
+		self.previous = self.rect.topleft  # position before the last tick
 
 	# handle platform movement
 	def update(self):
@@ -99,28 +104,66 @@ class Platform(pygame.sprite.Sprite):
 			self.move_direction *= -1
 			self.move_counter *= -1
 
+	# keep the position before a tick, to draw between it and the next
+	def remember(self):
+		self.previous = self.rect.topleft
+
 	# Draw the platform
-	def draw(self, screen):
-		screen.blit(self.image, self.rect)
+	def draw(self, screen, alpha=1.0):
+		return screen.blit(self.image, interpolate(self.previous, self.rect.topleft, alpha))
+
+# -----------------------------------------------------------------------------------------------------------
+
+class TileGrid():
+	"""Buckets rects by the tile cells they overlap, so lookups only touch nearby cells."""
+	def __init__(self, cell_size):
+		self.cell_size = cell_size
+		self.cells = {}		# (col, row) -> indices into items
+		self.items = []		# (rect, item) in insertion order
+
+	# cells covered by a rect
+	def cells_of(self, rect):
+		size = self.cell_size
+		for row in range(int(rect.top) // size, (int(rect.bottom) - 1) // size + 1):
+			for col in range(int(rect.left) // size, (int(rect.right) - 1) // size + 1):
+				yield (col, row)
+
+	def insert(self, rect, item):
+		index = len(self.items)
+		self.items.append((rect, item))
+		for cell in self.cells_of(rect):
+			self.cells.setdefault(cell, []).append(index)
+
+	# indices of items whose cells overlap rect, in insertion order
+	def indices(self, rect):
+		found = set()
+		for cell in self.cells_of(rect):
+			found.update(self.cells.get(cell, ()))
+		return sorted(found)
+
+	# (rect, item) pairs whose cells overlap rect, in insertion order
+	def query(self, rect):
+		return [self.items[i] for i in self.indices(rect)]
+
+	# True if any indexed rect collides with rect
+	def collides(self, rect):
+		for item_rect, item in self.query(rect):
+			if item_rect.colliderect(rect):
+				return True
+		return False
 
 # -----------------------------------------------------------------------------------------------------------
 
 class World():
 	def __init__(self):
-		self.assets = {}
+		self.static_layer = None	# background + static tiles, baked on first draw
 		self.load_assets()
 		self.initialize_tiles()
 
 	# Load game assets
 	def load_assets(self):
 		# Load the background
-		self.background = pygame.image.load(Config.Sprites["background"])
-		self.background = pygame.transform.scale(self.background, (screen_width, screen_height))
-
-		# Create an asset dictionary
-		for name, path in Config.Sprites.items():
-			if name != "background":
-				self.assets[name] =  pygame.image.load(path)
+		self.background = textures.get(Config.Sprites["background"], (screen_width, screen_height))
 
 	# Makes an image game object
 	def create_tile(self, row, col, name, custom_size, custom_location):
@@ -130,7 +173,7 @@ class World():
 		# default size
 		if not custom_size:
 
-			img = pygame.transform.scale(self.assets[name], (tile_size, tile_size))
+			img = textures.get(Config.Sprites[name], (tile_size, tile_size))
 			img_rect = img.get_rect()
 
 			if not custom_location:
@@ -145,7 +188,7 @@ class World():
 				world_tiles.append(t)
 
 		else:
-			img = pygame.transform.scale(self.assets[name], (custom_size[0], custom_size[1]))
+			img = textures.get(Config.Sprites[name], (custom_size[0], custom_size[1]))
 			img_rect = img.get_rect()
 
 			if not custom_location:
@@ -165,9 +208,13 @@ class World():
 		global check_points
 		global environmentals
 		global world_tiles
+		global tile_grid
+		global check_grid
+		global lava_grid
 		global current_level
 
 		world_tiles = []
+		self.static_layer = None
 
 		row = 0
 		index = 0
@@ -278,15 +325,50 @@ class World():
 		# reverse the list so assets are drawn from bottom to top
 		world_tiles = [ele for ele in reversed(world_tiles)]
 
+		# index tiles, checkpoints and lava by grid cell for collision lookups
+		tile_grid = TileGrid(tile_size)
+		for tile in world_tiles:
+			tile_grid.insert(tile[1], tile)
+
+		check_grid = TileGrid(tile_size)
+		for check in check_points[0]:
+			check_grid.insert(check.rect, check)
+
+		lava_grid = TileGrid(tile_size)
+		for lava in lava_tiles[0]:
+			lava_grid.insert(lava.rect, lava)
+
+	# Compose the background, tiles, checkpoints and lava into one surface.
+	# None of these move within a level, so this runs once per level load.
+	def build_static_layer(self):
+		layer = pygame.Surface((screen_width, screen_height))
+		if pygame.display.get_surface():
+			layer = layer.convert()
+
+		layer.blit(self.background, (0, 0))
+		for tile in world_tiles:
+			layer.blit(tile[0], tile[1])
+		check_points[0].draw(layer)
+		lava_tiles[0].draw(layer)
+
+		self.static_layer = layer
+
 	# Draw the background
 	def draw_world(self):
 		screen.blit(self.background, (0, 0))
 
-	# Draw the world data from the tiles we created
+	# Draw the pre-baked level (background included) in a single blit
 	def draw_tiles(self):
-		if world_tiles:
-			for tile in world_tiles:
-				screen.blit(tile[0], tile[1])
+		if self.static_layer is None:
+			self.build_static_layer()
+		screen.blit(self.static_layer, (0, 0))
+
+	# Repaint only the given screen regions from the pre-baked level
+	def restore_tiles(self, rects):
+		if self.static_layer is None:
+			self.build_static_layer()
+		for rect in rects:
+			screen.blit(self.static_layer, rect, rect)
 
 # -----------------------------------------------------------------------------------------------------------
 
@@ -322,6 +404,7 @@ class Character():
 		self.rect.y = y
 		self.rect.w = self.image.get_width()
 		self.rect.h = self.image.get_height()
+		self.previous = self.rect.topleft  # position before the last tick
 
 		self.direction = 0
 		self.vel_y = 0
@@ -334,9 +417,8 @@ class Character():
 	# Load all character images
 	def load_assets(self):
 		for name, path in Config.Player.items():
-			img = pygame.image.load(path)
-			img = pygame.transform.scale(img, (tile_size, tile_size))
-			img_left = pygame.transform.flip(img, True, False)
+			img = textures.get(path, (tile_size, tile_size))
+			img_left = textures.get(path, (tile_size, tile_size), True)
 
 			if 'idle' in name:
 				self.idle_right.append(img)
@@ -425,10 +507,11 @@ class Character():
 		self.death_counter += 1
 
 
-	# handle key presses
-	def controller(self, dx, dy, game_paused=False):
+	# handle key presses (key defaults to the live keyboard state)
+	def controller(self, dx, dy, game_paused=False, key=None):
 		value = []
-		key = pygame.key.get_pressed()
+		if key is None:
+			key = pygame.key.get_pressed()
 
 		# If game is paused, don't process any movement
 		if game_paused:
@@ -473,7 +556,9 @@ class Character():
 		global check_points
 		global lava_tiles
 		global game_over
-		global world_tiles
+		global tile_grid
+		global check_grid
+		global lava_grid
 		global game_finished
 		global current_level
 		global max_levels
@@ -482,23 +567,41 @@ class Character():
 		collision_thresh = 20 # distance between moving platform in y dir
 
 		self.in_air = True
-		for tile in world_tiles:
-			# check for collision in x direction ...
-			if tile[1].colliderect(self.rect.x + dx, self.rect.y, self.rect.w, self.rect.h):
-				dx = 0 # if we collide, stop player
-
-			# check collision in y direction of expected dy (change in y)
-			if tile[1].colliderect(self.rect.x, self.rect.y + dy, self.rect.w, self.rect.h):
-				# check if jumping
-				if self.vel_y < 0:
-					self.vel_y = 0
-					dy = tile[1].bottom - self.rect.top # dist between top of player and bottom of block
 
-				# check if falling
-				elif self.vel_y >= 0:
-					self.vel_y = 0
-					self.in_air = False
-					dy = tile[1].top - self.rect.bottom
+		# only tiles in the cells swept by the x and y probes can collide. Tiles are
+		# visited in world_tiles order, and whenever a hit changes dy the probe moves,
+		# so the lookup resumes with the cells the new probe covers.
+		checked = -1
+		resolved = False
+		while not resolved:
+			resolved = True
+			for index in tile_grid.indices(self.probe(dx, dy)):
+				if index <= checked:
+					continue
+				checked = index
+				tile = tile_grid.items[index][1]
+				last_dy = dy
+
+				# check for collision in x direction ...
+				if tile[1].colliderect(self.rect.x + dx, self.rect.y, self.rect.w, self.rect.h):
+					dx = 0 # if we collide, stop player
+
+				# check collision in y direction of expected dy (change in y)
+				if tile[1].colliderect(self.rect.x, self.rect.y + dy, self.rect.w, self.rect.h):
+					# check if jumping
+					if self.vel_y < 0:
+						self.vel_y = 0
+						dy = tile[1].bottom - self.rect.top # dist between top of player and bottom of block
+
+					# check if falling
+					elif self.vel_y >= 0:
+						self.vel_y = 0
+						self.in_air = False
+						dy = tile[1].top - self.rect.bottom
+
+				if dy != last_dy:
+					resolved = False
+					break
 
 		# check for collision with platforms
 		for platform in plats[0]:
@@ -521,7 +624,7 @@ class Character():
 					self.rect.x += platform.move_direction
 
 		# check for collision with checkpoint
-		if pygame.sprite.spritecollide(self, check_points[0], False):
+		if check_grid.collides(self.rect):
 			if current_level + 1 > max_levels:
 				game_finished = True
 				game_over = 0
@@ -529,7 +632,7 @@ class Character():
 				game_over = 1
 
 		# check for collision with lava
-		if pygame.sprite.spritecollide(self, lava_tiles[0], False):
+		if lava_grid.collides(self.rect):
 			self.death_animation()
 			self.rect.y = self.rect.y
 			self.rect.x = self.rect.x
@@ -538,19 +641,24 @@ class Character():
 		values.append(dy)
 		return values
 
+	# rect covering both the x and the y collision probes
+	def probe(self, dx, dy):
+		return pygame.Rect(self.rect.x + min(dx, 0) - 1, self.rect.y + min(dy, 0) - 1,
+						   self.rect.w + abs(dx) + 2, self.rect.h + abs(dy) + 2)
+
 	# create a 2px rect outline around the player
 	def draw_outline(self):
 		pygame.draw.rect(screen, (179, 29, 18), self.rect, 2)
 
-	# handle the player
-	def draw_player(self, game_paused=False):
+	# handle input, animation and physics for one frame
+	def update(self, game_paused=False, key=None):
 		global game_over
 		dx = 0
 		dy = 0
 
 		if game_over == 0:
 			# input handler - pass game_paused state
-			key = self.controller(dx, dy, game_paused)
+			key = self.controller(dx, dy, game_paused, key)
 			dx = key[0]
 			dy = key[1]
 
@@ -584,21 +692,29 @@ class Character():
 				else:
 					self.rect.y += dy
 
-		screen.blit(self.image, self.rect)
+	# keep the position before a tick, to draw between it and the next
+	def remember(self):
+		self.previous = self.rect.topleft
+
+	# draw the player alpha of the way from its last position to its current one
+	def draw_player(self, alpha=1.0):
+		return screen.blit(self.image, interpolate(self.previous, self.rect.topleft, alpha))
 
 # -----------------------------------------------------------------------------------------------------------
 
 class Chaser(pygame.sprite.Sprite):
 	def __init__(self, x, y):
 		pygame.sprite.Sprite.__init__(self)
-		img = pygame.image.load(Config.Sprites["bird"])
-		self.image = pygame.transform.scale(img, (int(40 * SCALE_FACTOR), int(40 * SCALE_FACTOR)))
+		self.image = textures.get(Config.Sprites["bird"], (int(40 * SCALE_FACTOR), int(40 * SCALE_FACTOR)))
 		self.rect = self.image.get_rect()
 		self.rect.x = x
 		self.rect.y = y
 		self.base_speed = 0.6 * SCALE_FACTOR  # Scaled base speed
 		self.speed = self.base_speed  # Current speed
-		self.model = tf.keras.models.load_model('chaser_model.h5') if os.path.exists('chaser_model.h5') else None
+		self.policy = load_policy()  # None falls back to chasing directly
+		self.async_policy = AsyncPolicy(self.policy) if Config.CHASER_ASYNC and self.policy else None
+		self.max_staleness = Config.CHASER_MAX_STALENESS  # frames an async action may lag behind
+		self.frame = 0  # frames moved, to age async results
 		self.buffer = []
 		self.max_buffer_size = 1000
 		self.training_enabled = False  # Disable training during gameplay
@@ -607,15 +723,23 @@ class Chaser(pygame.sprite.Sprite):
 		self.is_active = False  # Flag to track if chaser is active
 		self.paused_time = 0  # Track time spent paused
 		self.last_pause_time = 0  # Track when we last paused
+		self.previous = self.rect.topleft  # position before the last tick
 
-	def update(self, player, game_paused=False):
-		current_time = pygame.time.get_ticks()
-		
+	def update(self, player, game_paused=False, current_time=None):
+		# simulations pass their own clock, the game uses real ticks
+		if current_time is None:
+			current_time = pygame.time.get_ticks()
+
+		if self.advance_clock(game_paused, current_time):
+			self.move(player)
+
+	# handle the start delay and pauses; True if the chaser should move this frame
+	def advance_clock(self, game_paused, current_time):
 		# If game is paused by question, don't count this time
 		if game_paused:
 			if self.last_pause_time == 0:  # Just entered pause state
 				self.last_pause_time = current_time
-			return  # Don't process movement while paused
+			return False  # Don't process movement while paused
 		else:
 			if self.last_pause_time != 0:  # Just exited pause state
 				self.paused_time += current_time - self.last_pause_time
@@ -627,26 +751,183 @@ class Chaser(pygame.sprite.Sprite):
 			self.speed = self.base_speed * (1 + current_level * 0.16)
 
 		# Only move if active
-		if self.is_active:
-			dx = player.rect.x - self.rect.x
-			dy = player.rect.y - self.rect.y
-			
-			distance = max(abs(dx), abs(dy))
-			if distance > 0:
-				dx = dx / distance
-				dy = dy / distance
-			
-			if self.model is not None:
-				state = np.array([[dx, dy, distance]])
-				action = self.model.predict(state, verbose=0)[0]
-				self.rect.x += action[0] * self.speed
-				self.rect.y += action[1] * self.speed
-			else:
-				self.rect.x += dx * self.speed
-				self.rect.y += dy * self.speed
+		return self.is_active
+
+	# step towards the player
+	def move(self, player):
+		dx = player.rect.x - self.rect.x
+		dy = player.rect.y - self.rect.y
+
+		distance = max(abs(dx), abs(dy))
+		if distance > 0:
+			dx = dx / distance
+			dy = dy / distance
+
+		if self.policy is not None:
+			state = np.array([[dx, dy, distance]])
+			action = self.actions(state, np.array([[dx, dy]]))[0]
+			self.rect.x += action[0] * self.speed
+			self.rect.y += action[1] * self.speed
+		else:
+			self.rect.x += dx * self.speed
+			self.rect.y += dy * self.speed
+
+	# policy actions for a batch of states; in async mode the latest finished result,
+	# or the direct-chase fallback when that result is too old
+	def actions(self, states, fallback):
+		if self.async_policy is None:
+			return self.policy.predict(states)
+
+		self.frame += 1
+		self.async_policy.submit(self.frame, states)
+		result = self.async_policy.latest()
+		if result is None or self.frame - result[0] > self.max_staleness:
+			return fallback
+		return result[1]
+
+	# stop the background inference worker, if any
+	def close(self):
+		if self.async_policy is not None:
+			self.async_policy.close()
+
+	# True if the chaser touches rect
+	def collides(self, rect):
+		return self.rect.colliderect(rect)
+
+	# screen regions covered by the chaser
+	def rects(self):
+		return [self.rect]
+
+	# keep the position before a tick, to draw between it and the next
+	def remember(self):
+		self.previous = self.rect.topleft
+
+	# draw between the last two ticks; returns the regions drawn
+	def draw(self, screen, alpha=1.0):
+		return [screen.blit(self.image, interpolate(self.previous, self.rect.topleft, alpha))]
 
-	def draw(self, screen):
-		screen.blit(self.image, self.rect)
+# -----------------------------------------------------------------------------------------------------------
+
+class ChaserSwarm(Chaser):
+	"""Many chasers kept in NumPy arrays and moved together once per frame.
+
+	The (dx, dy, distance) states of every bird are built in one vectorized step
+	and the policy is evaluated once for the whole batch. The start delay and
+	pause handling are shared with Chaser, so the game drives a swarm exactly
+	like a single chaser. The inherited rect is kept as the bounding box of
+	every bird.
+	"""
+	def __init__(self, x, y, count, spread=None):
+		Chaser.__init__(self, x, y)
+		rng = np.random.default_rng(random.randrange(2 ** 32))
+		if spread is None:
+			spread = tile_size * 2
+		self.size = self.image.get_size()
+
+		# birds start scattered around (x, y) with slightly different speeds,
+		# on screen and clear of the player, who spawns at the same point
+		w, h = self.size
+		low = np.maximum([x - spread, y - spread], 0)
+		high = np.minimum([x + spread, y + spread], [screen_width - w, screen_height - h])
+		keep_clear = pygame.Rect(x, y, tile_size, tile_size).inflate(tile_size, tile_size)
+		positions = []
+		while len(positions) < count:
+			for bx, by in rng.uniform(low, high, (count, 2)):
+				if not keep_clear.colliderect(pygame.Rect(int(bx), int(by), w, h)):
+					positions.append((bx, by))
+		self.positions = np.array(positions[:count])
+		self.base_speeds = self.base_speed * rng.uniform(0.8, 1.2, count)
+		self.previous = self.positions.copy()
+		self.sync_rect()
+
+	def move(self, player):
+		delta = np.array([player.rect.x, player.rect.y], dtype=float) - self.positions
+		distance = np.abs(delta).max(axis=1)
+		direction = delta / np.maximum(distance, 1e-9)[:, None]
+
+		if self.policy is not None:
+			actions = self.actions(np.column_stack((direction, distance)), direction)
+		else:
+			actions = direction
+
+		# level speed-up applies to every bird, as for a single chaser
+		speeds = self.base_speeds * (self.speed / self.base_speed)
+		self.positions += actions * speeds[:, None]
+		self.sync_rect()
+
+	# keep rect around every bird, for anything that reads it like a single chaser's
+	def sync_rect(self):
+		corners = self.corners()
+		left, top = corners.min(axis=0).tolist()
+		right, bottom = (corners.max(axis=0) + self.size).tolist()
+		self.rect = pygame.Rect(left, top, right - left, bottom - top)
+
+	# integer top-left corners, as pygame rects would hold them
+	def corners(self):
+		return np.rint(self.positions).astype(int)
+
+	def collides(self, rect):
+		x, y = self.corners().T
+		w, h = self.size
+		return bool(np.any((x < rect.right) & (x + w > rect.left) & (y < rect.bottom) & (y + h > rect.top)))
+
+	def rects(self):
+		w, h = self.size
+		return [pygame.Rect(x, y, w, h) for x, y in self.corners()]
+
+	def remember(self):
+		self.previous = self.positions.copy()
+
+	def draw(self, screen, alpha=1.0):
+		corners = np.rint(self.previous + (self.positions - self.previous) * alpha).astype(int)
+		return screen.blits([(self.image, (x, y)) for x, y in corners])
+
+# make the chaser configured for the current level: a single bird or a swarm
+def make_chaser(x, y, count=None):
+	if count is None:
+		counts = Config.CHASERS_PER_LEVEL
+		count = counts[current_level] if current_level < len(counts) else 1
+	if count == 1:
+		return Chaser(x, y)
+	return ChaserSwarm(x, y, count)
+
+# -----------------------------------------------------------------------------------------------------------
+
+class DirtyRects():
+	"""Tracks the screen regions drawn each frame so only those reach the display.
+
+	Sprites drawn this frame are marked; next frame their regions are restored
+	from the static layer and both sets are pushed with one display.update().
+	Frames with a full-screen overlay (menu, questions, end screens) fall back
+	to a full update, and so does the frame after them.
+	"""
+	def __init__(self, enabled=True):
+		self.enabled = enabled
+		self.full = True		# the next frame repaints and pushes the whole screen
+		self.previous = []		# regions drawn last frame
+		self.current = []		# regions drawn this frame
+
+	# force a full repaint, e.g. after a level load
+	def invalidate(self):
+		self.full = True
+
+	# True if this frame has to repaint the whole level
+	def begin(self):
+		return self.full or not self.enabled
+
+	def mark(self, rect):
+		self.current.append(pygame.Rect(rect))
+
+	# push this frame to the display
+	def end(self, overlay=False):
+		if self.full or overlay or not self.enabled:
+			pygame.display.update()
+		else:
+			pygame.display.update(self.previous + self.current)
+
+		self.full = overlay
+		self.previous = self.current
+		self.current = []
 
 # -----------------------------------------------------------------------------------------------------------
 
@@ -654,8 +935,12 @@ class Game():
 	def __init__(self):
 		pygame.mixer.pre_init(44100, -16, 2, 512)
 		mixer.init()
-		self.fps = 60  # Fixed FPS at 60
+		self.fps = Config.MAX_FPS  # frame rate cap; the simulation runs at Config.TICK_RATE
+		self.tick_ms = 1000 / Config.TICK_RATE
+		self.accumulator = 0.0  # milliseconds of real time not yet simulated
 		self.clock = pygame.time.Clock()
+		self.dirty = DirtyRects(Config.DIRTY_RECTS)
+		self.profiler = FrameProfiler()
 		self.game_menu()
 		self.question_ui = QuestionUI(screen)  # Initialize question UI
 		self.score_font = pygame.font.SysFont('comicsansms', int(25 * SCALE_FACTOR))  # Scaled font size
@@ -665,15 +950,11 @@ class Game():
 
 	# setup in-game menu
 	def game_menu(self):
-		play_img = pygame.image.load(Config.UI["play"])
-		quit_img = pygame.image.load(Config.UI["quit"])
-		continue_img = pygame.image.load(Config.UI["continue"])
-		resume_img = pygame.image.load(Config.UI["resume"])
-
-		play_img = pygame.transform.scale(play_img, (int(200 * SCALE_FACTOR), int(70 * SCALE_FACTOR)))
-		quit_img = pygame.transform.scale(quit_img, (int(200 * SCALE_FACTOR), int(70 * SCALE_FACTOR)))
-		continue_img = pygame.transform.scale(continue_img, (int(200 * SCALE_FACTOR), int(70 * SCALE_FACTOR)))
-		resume_img = pygame.transform.scale(resume_img, (int(200 * SCALE_FACTOR), int(70 * SCALE_FACTOR)))
+		button_size = (int(200 * SCALE_FACTOR), int(70 * SCALE_FACTOR))
+		play_img = textures.get(Config.UI["play"], button_size)
+		quit_img = textures.get(Config.UI["quit"], button_size)
+		continue_img = textures.get(Config.UI["continue"], button_size)
+		resume_img = textures.get(Config.UI["resume"], button_size)
 
 		self.play_button = Button(screen_width // 2 - int(100 * SCALE_FACTOR), screen_height // 2, play_img)
 		self.quit_button = Button(screen_width // 2 - int(100 * SCALE_FACTOR), screen_height // 2 + int(110 * SCALE_FACTOR), quit_img)
@@ -714,10 +995,12 @@ class Game():
 
 		self.reset_groups()
 		self.properties()
+		self.chaser.close()
 		world = World()
 		player = Character(0, screen_height - 130)
-		chaser = Chaser(0, screen_height - 130)
+		chaser = make_chaser(0, screen_height - 130)
 		self.chaser = chaser  # Store chaser reference
+		self.dirty.invalidate()
 		game_over = 0
 
 		values = []
@@ -741,6 +1024,67 @@ class Game():
 			self.chaser.paused_time = 0  # Reset paused time
 			self.chaser.last_pause_time = 0  # Reset last pause time
 
+	# frame rate for screens that barely change (the menu, end screens, paused questions), or None during play
+	def idle_fps(self):
+		if in_menu or game_over == -1 or game_finished:
+			return Config.IDLE_FPS
+		if self.question_ui.is_game_paused():
+			return Config.PAUSED_FPS
+		return None
+
+	# sleep until an event arrives or timeout (ms) passes; events are left queued, in order, for the loop
+	def wait_for_input(self, timeout):
+		event = pygame.event.wait(timeout)
+		if event.type != pygame.NOEVENT:
+			for queued in [event] + pygame.event.get():
+				pygame.event.post(queued)
+
+	# advance the level by one fixed tick: input, physics, platforms, the chaser and question timers
+	def tick(self, player, chaser):
+		global game_over
+
+		player.remember()
+		chaser.remember()
+		for platform in plats[0]:
+			platform.remember()
+
+		# Pass game_paused state to player
+		player.update(self.question_ui.is_game_paused())
+		self.profiler.lap("player")
+
+		# Update chaser with current pause state
+		chaser.update(player, self.question_ui.is_game_paused())
+		self.profiler.lap("chaser")
+
+		# Only update game elements if not paused
+		if not self.question_ui.is_game_paused():
+			# Update platforms only when not paused
+			plats[0].update()
+
+			# Check for collision between player and chaser, once it has woken up
+			if game_over == 0 and chaser.is_active and chaser.collides(player.rect):
+				game_over = -1  # Player caught by chaser
+		self.profiler.lap("platforms")
+
+		# Check for collision with moving platforms in level 1
+		if current_level == 0:  # Level 1
+			for platform in plats[0]:
+				# Check if player is on top of the platform with a small tolerance
+				if (not platform.question_shown and 
+					abs(player.rect.bottom - platform.rect.top) <= 2 and  # Small tolerance for exact position
+					player.rect.right > platform.rect.left + 5 and   # Small margin from edges
+					player.rect.left < platform.rect.right - 5 and
+					not player.in_air):  # Player is not jumping/falling
+					
+					platform.question_shown = True
+					self.question_ui.show_random_question()
+					self.question_ui.set_game_paused(True)
+
+		# question fades and the feedback delay count ticks, not frames
+		if self.question_ui.is_active():
+			self.question_ui.tick()
+		self.profiler.lap("questions")
+
 	# start game functionality
 	def start(self):
 		global in_menu
@@ -753,19 +1097,28 @@ class Game():
 		self.properties()
 		world = World()
 		player = Character(0, screen_height - 130)
-		chaser = Chaser(0, screen_height - 130)
+		chaser = make_chaser(0, screen_height - 130)
 		self.chaser = chaser  # Store chaser reference
 
 		run = True
 		while(run):
-			# Maintain consistent FPS
-			self.clock.tick(self.fps)
+			# idle screens are redrawn on input or at their low rate; play resumes the full rate
+			idle_fps = self.idle_fps()
+			if idle_fps:
+				self.wait_for_input(1000 // idle_fps)
 
-			# draw assets onto the screen
-			world.draw_world()
+			# real time since the last frame, simulated below in fixed ticks
+			elapsed = self.clock.tick(self.fps)
+			self.profiler.begin_frame()
+
+			# menu frames cover the whole screen, even the one that leaves the menu
+			overlay = in_menu
 
 			# setup main menu
 			if in_menu:
+				# draw assets onto the screen
+				world.draw_world()
+
 				# --- Draw Rules ---
 				rules = [
 					("Reach the final flag to finish the level.", 0),
@@ -812,55 +1165,49 @@ class Game():
 					points = 0  # Reset points when starting new game
 					self.game_timer()  # Start timer only after play button is clicked
 					self.timer_started = True  # Mark timer as started
+				self.accumulator = 0.0  # nothing is simulated in the menu
+				self.profiler.lap("menu")
 			else:
-				world.draw_tiles()
-				check_points[0].draw(screen)
-				lava_tiles[0].draw(screen)
-				
-				# Pass game_paused state to player
-				player.draw_player(self.question_ui.is_game_paused())
-				
-				# Draw platforms first
-				plats[0].draw(screen)
-				
-				# Update chaser with current pause state
-				chaser.update(player, self.question_ui.is_game_paused())
-				
-				# Only update game elements if not paused
-				if not self.question_ui.is_game_paused():
-					# Update platforms only when not paused
-					plats[0].update()
-					chaser.draw(screen)
-					
-					# Draw timer and score if game is not paused and timer has started
-					if self.timer_started:
-						screen.blit(self.timer_font.render(self.timer_text, True, (47, 48, 29)), (60, 42))
-						screen.blit(self.score_font.render(f"Score: {points}", True, (47, 48, 29)), (screen_width - 150, 42))
-					
-					# Check for collision between player and chaser
-					if chaser.rect.colliderect(player.rect):
-						game_over = -1  # Player caught by chaser
+				# run as many ticks as real time has covered; past MAX_TICKS_PER_FRAME the rest is dropped
+				self.accumulator = min(self.accumulator + elapsed, self.tick_ms * Config.MAX_TICKS_PER_FRAME)
+				while self.accumulator >= self.tick_ms:
+					self.tick(player, chaser)
+					self.accumulator -= self.tick_ms
+					# a finished or lost level is handled below before anything else moves
+					if game_over != 0:
+						self.accumulator = 0.0
+						break
+				alpha = self.accumulator / self.tick_ms
+
+				# background, tiles, checkpoints and lava are one pre-baked layer;
+				# on partial frames only last frame's sprite regions are restored
+				if self.dirty.begin():
+					world.draw_tiles()
 				else:
-					# When paused, just draw the chaser without updating
-					chaser.draw(screen)
-
-				# Check for collision with moving platforms in level 1
-				if current_level == 0:  # Level 1
-					for platform in plats[0]:
-						# Check if player is on top of the platform with a small tolerance
-						if (not platform.question_shown and 
-							abs(player.rect.bottom - platform.rect.top) <= 2 and  # Small tolerance for exact position
-							player.rect.right > platform.rect.left + 5 and   # Small margin from edges
-							player.rect.left < platform.rect.right - 5 and
-							not player.in_air):  # Player is not jumping/falling
-							
-							platform.question_shown = True
-							self.question_ui.show_random_question()
-							self.question_ui.set_game_paused(True)
+					world.restore_tiles(self.dirty.previous)
+				self.profiler.lap("tiles")
+
+				# sprites are drawn alpha of the way between their last two ticks
+				self.dirty.mark(player.draw_player(alpha))
+
+				# Draw platforms first
+				for platform in plats[0]:
+					self.dirty.mark(platform.draw(screen, alpha))
+
+				for rect in chaser.draw(screen, alpha):
+					self.dirty.mark(rect)
+
+				# Draw timer and score if game is not paused and timer has started
+				if self.timer_started and not self.question_ui.is_game_paused():
+					self.dirty.mark(screen.blit(self.timer_font.render(self.timer_text, True, (47, 48, 29)), (60, 42)))
+					self.dirty.mark(screen.blit(self.score_font.render(f"Score: {points}", True, (47, 48, 29)), (screen_width - 150, 42)))
+
+				self.profiler.lap("sprites")
 
 				# Draw question UI if active
 				if self.question_ui.is_active():
 					self.question_ui.draw()
+				self.profiler.lap("question_draw")
 
 				# player active
 				if game_over == 0:
@@ -954,10 +1301,19 @@ class Game():
 					if self.quit_button.draw(screen):
 						run = False
 
+				self.profiler.lap("screens")
+
 			for event in pygame.event.get():
 				if event.type == pygame.QUIT:
 					run = False
 
+				# profiler overlay and CSV export
+				if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+					self.profiler.toggle()
+					self.dirty.invalidate()
+				if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+					self.profiler.export_csv()
+
 				# Handle question UI events
 				if self.question_ui.is_active():
 					result = self.question_ui.handle_events(event)
@@ -980,13 +1336,176 @@ class Game():
 						if not game_finished:
 							game_over = -1
 
-			pygame.display.update()
+			self.profiler.lap("events")
+			profile_rect = self.profiler.draw(screen)
+			if profile_rect:
+				self.dirty.mark(profile_rect)
+
+			# overlays cover the whole screen, so those frames are pushed in full
+			overlay = overlay or self.question_ui.is_active() or game_over != 0 or game_finished
+			self.dirty.end(overlay)
+			self.profiler.lap("display")
+			self.profiler.end_frame()
+
+# -----------------------------------------------------------------------------------------------------------
+
+class ScriptedInput():
+	"""Replays [frames, keys] segments (e.g. [40, "dw"]) as per-frame key states."""
+	key_codes = {"w": pygame.K_w, "a": pygame.K_a, "d": pygame.K_d}
+
+	def __init__(self, segments):
+		self.segments = [(int(frames), self.key_state(keys)) for frames, keys in segments]
+		self.idle = self.key_state("")
+
+	# key state indexable like pygame.key.get_pressed()
+	def key_state(self, keys):
+		state = defaultdict(bool)
+		for k in keys:
+			state[self.key_codes[k]] = True
+		return state
+
+	# yield one key state per frame, idling once the script runs out
+	def frames(self):
+		for count, state in self.segments:
+			for _ in range(count):
+				yield state
+		while True:
+			yield self.idle
+
+# -----------------------------------------------------------------------------------------------------------
+
+class Simulation():
+	"""Runs the game's physics, platforms and chaser for one level without rendering.
+
+	Ticks advance as fast as the CPU allows; the level timer and the chaser
+	delay are counted in simulated ticks instead of wall-clock time.
+	Platform questions are a UI feature and are not triggered here.
+	"""
+	def __init__(self, level=0, time_limit=30, seed=None, chasers=None):
+		global current_level
+
+		self.fps = Config.TICK_RATE
+		self.chasers = chasers	# None uses Config.CHASERS_PER_LEVEL
+		self.max_frames = time_limit * self.fps
+		if seed is not None:
+			random.seed(seed)
+
+		current_level = level
+		self.load_level()
+
+	# load level, mirroring Game.load_level
+	def load_level(self):
+		global plats
+		global check_points
+		global lava_tiles
+		global game_over
+		global game_finished
+
+		plats = [pygame.sprite.Group()]
+		check_points = [pygame.sprite.Group()]
+		lava_tiles = [pygame.sprite.Group()]
+		game_over = 0
+		game_finished = False
+
+		if hasattr(self, "chaser"):
+			self.chaser.close()
+
+		self.world = World()
+		self.player = Character(0, screen_height - 130)
+		self.chaser = make_chaser(0, screen_height - 130, self.chasers)
+		self.chaser.start_time = 0
+		self.frame = 0
+		self.caught = False
+
+	# simulated time in milliseconds
+	def ticks(self):
+		return self.frame * 1000 // self.fps
+
+	# advance one tick, in the same order as Game.tick
+	def step(self, key):
+		global game_over
+
+		self.player.update(False, key)
+		self.chaser.update(self.player, False, self.ticks())
+		plats[0].update()
+
+		if game_over == 0 and self.chaser.is_active and self.chaser.collides(self.player.rect):
+			game_over = -1
+			self.caught = True
+
+		self.frame += 1
+
+	# None while the level is still running
+	def outcome(self):
+		if game_finished or game_over == 1:
+			return "finished"
+		if game_over == -1:
+			return "caught" if self.caught else "died"
+		if self.frame >= self.max_frames:
+			return "timeout"
+		return None
+
+	# play scripted input segments until the level ends
+	def run(self, segments):
+		keys = ScriptedInput(segments).frames()
+		while self.outcome() is None:
+			self.step(next(keys))
+		self.chaser.close()
+
+		return {
+			"level": current_level,
+			"outcome": self.outcome(),
+			"frames": self.frame,
+			"x": self.player.rect.x,
+			"y": self.player.rect.y,
+		}
+
+# run every playthrough in a JSON script and print one JSON result per line
+def run_headless(path):
+	with open(path) as f:
+		script = json.load(f)
+
+	# a single playthrough or a list of them
+	if isinstance(script, dict):
+		script = [script]
+
+	for playthrough in script:
+		sim = Simulation(playthrough.get("level", 0), playthrough.get("time_limit", 30),
+						 playthrough.get("seed"), playthrough.get("chasers"))
+		print(json.dumps(sim.run(playthrough.get("inputs", []))))
+
+# open the game window; everything above can be imported without one
+def init_display():
+	global screen
+
+	pygame.init()
+	if Config.VSYNC:
+		# vsync needs a renderer-backed window, which SCALED provides
+		screen = pygame.display.set_mode((screen_width, screen_height), pygame.SCALED, vsync=1)
+	else:
+		screen = pygame.display.set_mode((screen_width, screen_height))
+	pygame.display.set_caption('Mazer')
+	return screen
 
 # Start the game
-try:
-	game = Game()
-	pygame.quit()
-except Exception as e:
-	print(f"Fatal error: {str(e)}")
-	print(traceback.format_exc())
-	pygame.quit()
\ No newline at end of file
+def main(argv=None):
+	argv = sys.argv[1:] if argv is None else argv
+	try:
+		if "--headless" in argv:
+			# usage: python main.py --headless playthroughs.json
+			# the dummy SDL drivers must be selected before pygame is initialized
+			os.environ["SDL_VIDEODRIVER"] = "dummy"
+			os.environ["SDL_AUDIODRIVER"] = "dummy"
+			init_display()
+			run_headless(argv[argv.index("--headless") + 1])
+		else:
+			init_display()
+			game = Game()
+		pygame.quit()
+	except Exception as e:
+		print(f"Fatal error: {str(e)}")
+		print(traceback.format_exc())
+		pygame.quit()
+
+if __name__ == "__main__":
+	main()
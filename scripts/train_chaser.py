@@ -2,158 +2,257 @@ import pygame
 import numpy as np
 import tensorflow as tf
 import os
+import glob
+import time
+import argparse
+import Config
+from ChaserPolicy import export_weights
 from main import Chaser, screen_width, screen_height
 
+STEPS_PER_EXECUTION = 64   # training batches run per compiled call
+SNAPSHOT_DIR = "training_snapshots"   # where periodic PNG snapshots of the training view go
+
 def create_model():
     model = tf.keras.Sequential([
         tf.keras.layers.Dense(64, activation='relu', input_shape=(3,)),
         tf.keras.layers.Dense(32, activation='relu'),
         tf.keras.layers.Dense(2, activation='tanh')  # Output x,y movement
     ])
-    model.compile(optimizer='adam', loss='mse')
+    # run many small batches per compiled call; per-step dispatch dominates a net this size
+    model.compile(optimizer='adam', loss='mse', steps_per_execution=STEPS_PER_EXECUTION, jit_compile=True)
     return model
 
-def generate_training_data(num_samples=10000):
+# Each movement family turns a random generator and a row count into (n, 4) rows
+# of dx, dy, speed, facing.
+
+def random_movement(rng, n):
+    # Random movement pattern
+    return np.clip(rng.normal(0, 0.5, (n, 4)), -1, 1)
+
+def circular_movement(rng, n):
+    # Circular movement pattern
+    angle = rng.uniform(0, 2 * np.pi, n)
+    return np.column_stack([np.cos(angle), np.sin(angle), rng.uniform(0.5, 1.0, n), np.sign(np.cos(angle))])
+
+def direct_chase(rng, n):
+    # Direct chase pattern
+    target = rng.normal(0, 0.5, (n, 2))
+    direction = target / (np.linalg.norm(target, axis=1, keepdims=True) + 1e-8)
+    return np.column_stack([direction, rng.uniform(0.5, 1.0, n), np.sign(direction[:, 0])])
+
+def zigzag_movement(rng, n):
+    # Zigzag pattern
+    phase = np.arange(n) * 0.1
+    return np.column_stack([np.sin(phase), np.cos(phase), rng.uniform(0.5, 1.0, n), np.sign(np.sin(phase))])
+
+def predictive_chase(rng, n):
+    # Predictive chase pattern
+    future_pos = rng.normal(0, 0.5, (n, 2))
+    current_pos = rng.normal(0, 0.5, (n, 2))
+    offset = future_pos - current_pos
+    velocity = offset / (np.linalg.norm(offset, axis=1, keepdims=True) + 1e-8)
+    return np.column_stack([velocity, rng.uniform(0.5, 1.0, n), np.sign(velocity[:, 0])])
+
+MOVEMENT_FAMILIES = {
+    "random": random_movement,
+    "circular": circular_movement,
+    "direct": direct_chase,
+    "zigzag": zigzag_movement,
+    "predictive": predictive_chase,
+}
+
+# split num_samples between the families in proportion to their mix weights
+def family_counts(num_samples, mix):
+    unknown = set(mix) - set(MOVEMENT_FAMILIES)
+    if unknown:
+        raise ValueError(f"unknown movement families: {sorted(unknown)}")
+
+    if any(weight < 0 for weight in mix.values()):
+        raise ValueError(f"movement family weights must not be negative: {mix}")
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError(f"movement family weights must not all be zero: {mix}")
+
+    shares = {name: num_samples * weight / total for name, weight in mix.items()}
+    counts = {name: int(share) for name, share in shares.items()}
+    # hand rounding leftovers to the largest remainders; a weight of 0 never gets one
+    weighted = [name for name in mix if mix[name] > 0]
+    weighted.sort(key=lambda name: shares[name] - counts[name], reverse=True)
+    for name in weighted[:num_samples - sum(counts.values())]:
+        counts[name] += 1
+    return counts
+
+def generate_training_data(num_samples=50000, seed=None, mix=None):
+    """Generates num_samples rows split over the movement families by mix
+    (family name -> weight, an even split by default); a seed makes it repeatable."""
     print("Generating training data...")
-    training_data = []
-    
-    # Generate various movement patterns
-    for _ in range(num_samples):
-        # Random movement pattern
-        movement = np.random.normal(0, 0.5, 4)
-        movement = np.clip(movement, -1, 1)
-        training_data.append(movement)
-        
-        # Circular movement pattern
-        angle = np.random.uniform(0, 2 * np.pi)
-        movement = np.array([
-            np.cos(angle),
-            np.sin(angle),
-            np.random.uniform(0.5, 1.0),
-            np.sign(np.cos(angle))
-        ])
-        training_data.append(movement)
-        
-        # Direct chase pattern
-        target = np.random.normal(0, 0.5, 2)
-        direction = target / (np.linalg.norm(target) + 1e-8)
-        movement = np.array([
-            direction[0],
-            direction[1],
-            np.random.uniform(0.5, 1.0),
-            np.sign(direction[0])
-        ])
-        training_data.append(movement)
-        
-        # Zigzag pattern
-        zigzag = np.array([
-            np.sin(_ * 0.1),
-            np.cos(_ * 0.1),
-            np.random.uniform(0.5, 1.0),
-            np.sign(np.sin(_ * 0.1))
-        ])
-        training_data.append(zigzag)
-        
-        # Predictive chase pattern
-        future_pos = np.random.normal(0, 0.5, 2)
-        current_pos = np.random.normal(0, 0.5, 2)
-        velocity = (future_pos - current_pos) / (np.linalg.norm(future_pos - current_pos) + 1e-8)
-        movement = np.array([
-            velocity[0],
-            velocity[1],
-            np.random.uniform(0.5, 1.0),
-            np.sign(velocity[0])
-        ])
-        training_data.append(movement)
-    
-    return np.array(training_data)
+    rng = np.random.default_rng(seed)
+    mix = mix or {name: 1 for name in MOVEMENT_FAMILIES}
+
+    blocks = [MOVEMENT_FAMILIES[name](rng, n) for name, n in family_counts(num_samples, mix).items() if n]
+    return np.concatenate(blocks) if blocks else np.empty((0, 4))
+
+# states and target actions from the shards written by generate_rollouts.py
+def load_rollouts(directory):
+    paths = sorted(glob.glob(os.path.join(directory, "*.npz")))
+    if not paths:
+        raise SystemExit(f"No rollout shards found in {directory}")
+
+    shards = [np.load(path) for path in paths]
+    print(f"Loaded {len(paths)} rollout shards from {directory}")
+    return (np.concatenate([shard["states"] for shard in shards]),
+            np.concatenate([shard["actions"] for shard in shards]))
+
+def make_dataset(X, y, batch_size, seed=None):
+    # state -> movement pairs, reshuffled every epoch and batched off the training thread
+    X = X.astype(np.float32)
+    y = y.astype(np.float32)
+    dataset = tf.data.Dataset.from_tensor_slices((X, y))
+    dataset = dataset.shuffle(len(X), seed=seed, reshuffle_each_iteration=True)
+    return dataset.batch(batch_size, drop_remainder=True).prefetch(tf.data.AUTOTUNE)
+
+class TrainingMonitor(tf.keras.callbacks.Callback):
+    """Reports loss, epoch time and samples per second, and saves the model periodically."""
+    def __init__(self, samples_per_epoch, report_interval=10, save_interval=100):
+        super().__init__()
+        self.samples_per_epoch = samples_per_epoch
+        self.report_interval = report_interval
+        self.save_interval = save_interval
+
+    def on_train_begin(self, logs=None):
+        self.train_start = time.perf_counter()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        epoch_time = time.perf_counter() - self.epoch_start
 
-def train_model(epochs=1000, batch_size=32, save_interval=100):
-    # Initialize pygame
-    pygame.init()
-    screen = pygame.display.set_mode((screen_width, screen_height))
-    pygame.display.set_caption('Chaser Training')
-    
-    # Create chaser instance
-    chaser = Chaser(screen_width//2, screen_height//2)
-    
-    # Create and compile model
-    model = create_model()
-    
-    # Generate training data
-    training_data = generate_training_data()
-    
-    print(f"Starting training for {epochs} epochs...")
-    print(f"Training data shape: {training_data.shape}")
-    
-    # Training loop
-    for epoch in range(epochs):
-        # Shuffle training data
-        np.random.shuffle(training_data)
-        
-        total_loss = 0
-        batches = 0
-        
-        # Train in batches
-        for i in range(0, len(training_data), batch_size):
-            batch = training_data[i:i + batch_size]
-            if len(batch) == batch_size:  # Only use complete batches
-                # Prepare input and target data
-                X = batch[:, :3]  # State: dx, dy, distance
-                y = batch[:, :2]  # Target: dx, dy movement
-                
-                # Train step
-                loss = model.train_on_batch(X, y)
-                total_loss += loss
-                batches += 1
-        
-        # Calculate average loss
-        avg_loss = total_loss / batches if batches > 0 else 0
-        
         # Print progress
-        if (epoch + 1) % 10 == 0:
-            print(f"Epoch {epoch + 1}/{epochs}")
-            print(f"Loss: {avg_loss:.4f}")
-        
+        if (epoch + 1) % self.report_interval == 0:
+            print(f"Epoch {epoch + 1}/{self.params['epochs']}")
+            print(f"Loss: {logs['loss']:.4f} - {epoch_time:.2f}s/epoch - "
+                  f"{self.samples_per_epoch / epoch_time:,.0f} samples/s")
+
         # Save model periodically
-        if (epoch + 1) % save_interval == 0:
+        if (epoch + 1) % self.save_interval == 0:
             print(f"Saving model at epoch {epoch + 1}...")
-            model.save('chaser_model.h5')
-            
+            self.model.save(Config.Models["chaser"])
+
+    def on_train_end(self, logs=None):
+        print(f"Trained in {time.perf_counter() - self.train_start:.1f}s")
+
+class TrainingView(tf.keras.callbacks.Callback):
+    """Draws a few sampled movements onto a surface after training epochs.
+
+    With a window the drawing is shown every epoch and closing the window stops
+    training; with snapshot_interval set it is also saved as a PNG every that many
+    epochs. Headless training passes an off-screen surface and no window.
+    """
+    def __init__(self, surface, window=True, snapshot_interval=None, snapshot_dir=SNAPSHOT_DIR):
+        super().__init__()
+        self.surface = surface
+        self.window = window
+        self.snapshot_interval = snapshot_interval
+        self.snapshot_dir = snapshot_dir
+        self.closed = False
+
+    def on_epoch_end(self, epoch, logs=None):
+        snapshot = self.snapshot_interval and (epoch + 1) % self.snapshot_interval == 0
+        if not (self.window or snapshot):
+            return
+
+        self.draw_movements()
+
+        if snapshot:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            pygame.image.save(self.surface, os.path.join(self.snapshot_dir, f"epoch_{epoch + 1:04d}.png"))
+
+        if self.window:
+            pygame.display.flip()
+
+            # Handle pygame events
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.closed = True
+                    self.model.stop_training = True
+
+    def draw_movements(self):
         # Visualize training
-        screen.fill((255, 255, 255))
-        
-        # Generate and display some movements
-        for _ in range(10):
-            state = np.random.normal(0, 0.5, 3)
-            state = np.clip(state, -1, 1)
-            action = model.predict(np.array([state]), verbose=0)[0]
-            
+        self.surface.fill((255, 255, 255))
+
+        # Generate and display some movements, predicted in one call
+        states = np.clip(np.random.normal(0, 0.5, (10, 3)), -1, 1).astype(np.float32)
+        actions = np.asarray(self.model(states, training=False))
+
+        for action in actions:
             start_x = np.random.randint(0, screen_width)
             start_y = np.random.randint(0, screen_height)
             end_x = int(start_x + action[0] * 50)
             end_y = int(start_y + action[1] * 50)
-            
+
             # Draw movement line
-            pygame.draw.line(screen, (0, 0, 255), 
-                           (start_x, start_y), 
+            pygame.draw.line(self.surface, (0, 0, 255),
+                           (start_x, start_y),
                            (end_x, end_y), 2)
-            
+
             # Draw direction indicator
-            pygame.draw.circle(screen, (255, 0, 0), 
+            pygame.draw.circle(self.surface, (255, 0, 0),
                              (end_x, end_y), 5)
-        
-        pygame.display.flip()
-        
-        # Handle pygame events
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                return
+
+def train_model(epochs=1000, batch_size=32, save_interval=100, seed=None,
+                headless=False, snapshot_interval=None, rollouts=None):
+    if headless:
+        # no display: draw snapshots off-screen
+        screen = pygame.Surface((screen_width, screen_height))
+    else:
+        # Initialize pygame
+        pygame.init()
+        screen = pygame.display.set_mode((screen_width, screen_height))
+        pygame.display.set_caption('Chaser Training')
+    
+    # Create chaser instance
+    chaser = Chaser(screen_width//2, screen_height//2)
+    
+    # Create and compile model
+    model = create_model()
+    
+    # Generate training data
+    if rollouts:
+        X, y = load_rollouts(rollouts)
+    else:
+        training_data = generate_training_data(seed=seed)
+        X = training_data[:, :3]  # State: dx, dy, distance
+        y = training_data[:, :2]  # Target: dx, dy movement
+    dataset = make_dataset(X, y, batch_size, seed)
+    samples_per_epoch = len(X) // batch_size * batch_size
+    
+    print(f"Starting training for {epochs} epochs...")
+    print(f"Training samples: {len(X)}, batch size: {batch_size}")
+    
+    view = TrainingView(screen, not headless, snapshot_interval)
+    monitor = TrainingMonitor(samples_per_epoch, save_interval=save_interval)
+    model.fit(dataset, epochs=epochs, verbose=0, callbacks=[monitor, view])
+    if view.closed:
+        pygame.quit()
+        return
     
     print("Training completed!")
-    model.save('chaser_model.h5')
+    model.save(Config.Models["chaser"])
+    export_weights(model, Config.Models["chaser_weights"])
     pygame.quit()
 
 if __name__ == "__main__":
-    train_model() 
+    parser = argparse.ArgumentParser(description="Train the chaser policy")
+    parser.add_argument("--epochs", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--rollouts", metavar="DIR",
+                        help="train on shards from generate_rollouts.py instead of synthetic patterns")
+    parser.add_argument("--headless", action="store_true", help="train without opening a window")
+    parser.add_argument("--snapshot-every", type=int, metavar="N",
+                        help=f"save the movement view as a PNG in {SNAPSHOT_DIR}/ every N epochs")
+    args = parser.parse_args()
+
+    train_model(args.epochs, args.batch_size, seed=args.seed,
+                headless=args.headless, snapshot_interval=args.snapshot_every, rollouts=args.rollouts)